@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Batch Wraps
+
+Builds wraps for many exports at once - a folder of users, or a service
+working through a queue - as a pipeline of four stages connected by
+bounded queues:
+
+    ingest   read the export from disk (in a thread)
+    extract  analyze it (wrapped_stats.analyze, in a worker process)
+    render   render every page (fanned out over the worker processes,
+             which share the stats - see shared_stats.py) and put the
+             overlays on the template
+    write    save the PDF (in a thread)
+
+The stages run concurrently under asyncio, so one user's export is being
+read while another's is analyzed, a third's pages are rendered and a
+fourth's PDF is written. Each queue holds at most --queue-size items, so
+a slow stage holds the earlier ones back instead of piling exports up in
+memory: at most that many wraps wait between any two stages, plus the
+ones being worked on.
+
+Usage:
+    python batch_wraps.py exports/*.json --out-dir wraps --year 2025 --jobs 4
+
+A wrap is named after its export (alice.json -> wraps/alice.pdf), or the
+folder it's in when the export is a conversations.json
+(alice/conversations.json -> wraps/alice.pdf).
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from compile_pdf import INPUT_PDF, compose_pdf, render_page
+from daily_stats import year_range
+from incremental_pdf import save_update, update_bytes
+from page_registry import get_page, load_plugins, optional_pages, select_pages
+from settings import load_settings
+from shared_stats import SharedStats, attached_stats, start_tracker
+from wrapped_stats import analyze
+
+# Wraps waiting between two stages, at most
+QUEUE_SIZE = 2
+
+# Marks the end of a queue
+DONE = None
+
+
+def output_name(export_path):
+    """The wrap's file name for an export."""
+    stem = os.path.splitext(os.path.basename(export_path))[0]
+    if stem == "conversations":
+        stem = os.path.basename(os.path.dirname(os.path.abspath(export_path))) or stem
+    return stem + ".pdf"
+
+
+def read_export(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def extract_export(raw, options):
+    """The stats dict for one export's contents (runs in a worker)."""
+    return analyze(BytesIO(raw), **options).to_dict()
+
+
+def render_shared(descriptor, page_name):
+    """(overlay bytes or None, error or None) for one page of one user's stats."""
+    with attached_stats(descriptor):
+        return render_page(get_page(page_name))
+
+
+def compose_wrap(template_overlays, extra_overlays, incremental):
+    """The finished PDF's bytes (just the update to the template with incremental)."""
+    writer = compose_pdf(template_overlays, extra_overlays, incremental=incremental,
+                         log=lambda message: None)
+    if incremental:
+        return update_bytes(writer, INPUT_PDF)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def save_wrap(pdf, output_path, incremental):
+    """Write a wrap via a temporary file, so it's never seen half-written."""
+    if incremental:
+        save_update(pdf, INPUT_PDF, output_path + ".tmp")
+    else:
+        with open(output_path + ".tmp", "wb") as f:
+            f.write(pdf)
+    os.replace(output_path + ".tmp", output_path)
+
+
+class Pipeline:
+    """The stages and the state they share: the worker pool and the timings."""
+
+    def __init__(self, pool, options, pages, out_dir, incremental=False, queue_size=QUEUE_SIZE):
+        self.pool = pool
+        self.options = options
+        self.overlay_pages, self.extra_pages = pages
+        self.out_dir = out_dir
+        self.incremental = incremental
+        self.queue_size = queue_size
+        self.busy = {"ingest": 0.0, "extract": 0.0, "render": 0.0, "write": 0.0}
+        self.written = []
+        self.failed = []
+
+    def in_pool(self, function, *args):
+        return asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+
+    async def ingest(self, paths, outbox):
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                raw = await asyncio.to_thread(read_export, path)
+            except OSError as e:
+                print(f"   {path}: ingest failed - {e}")
+                self.failed.append(path)
+                continue
+            self.busy["ingest"] += time.perf_counter() - started
+            await outbox.put((path, raw))
+        await outbox.put(DONE)
+
+    async def extract(self, path, raw):
+        return await self.in_pool(extract_export, raw, self.options)
+
+    async def render(self, path, data):
+        pages = list(self.overlay_pages.values()) + self.extra_pages
+        with SharedStats(data) as shared:
+            del data
+            results = await asyncio.gather(*(self.in_pool(render_shared, shared.descriptor, page.name)
+                                             for page in pages))
+        overlays = {}
+        for page, (overlay, error) in zip(pages, results):
+            if error is not None:
+                print(f"   {path}: {page.name}: Error - {error}")
+            overlays[page.name] = overlay
+        return await self.in_pool(
+            compose_wrap,
+            {page_num: overlays[page.name] for page_num, page in self.overlay_pages.items()},
+            [(page.name, overlays[page.name]) for page in self.extra_pages],
+            self.incremental)
+
+    async def write(self, path, pdf):
+        output_path = os.path.join(self.out_dir, output_name(path))
+        await asyncio.to_thread(save_wrap, pdf, output_path, self.incremental)
+        print(f"   {path} -> {output_path}")
+        self.written.append(output_path)
+
+    async def stage(self, name, work, inbox, outbox=None, workers=1):
+        """
+        Take wraps from inbox, do a stage's work on them with that many
+        running at once, and pass the results on to outbox.
+        """
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is DONE:
+                    # Leave it for the stage's other workers
+                    await inbox.put(DONE)
+                    return
+                path, value = item
+                started = time.perf_counter()
+                try:
+                    result = await work(path, value)
+                except Exception as e:
+                    print(f"   {path}: {name} failed - {e}")
+                    self.failed.append(path)
+                    continue
+                finally:
+                    del item, value
+                    self.busy[name] += time.perf_counter() - started
+                if outbox is not None:
+                    await outbox.put((path, result))
+                del result
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            await outbox.put(DONE)
+
+    async def run(self, paths, extract_workers=1):
+        raw, stats, pdfs = (asyncio.Queue(max(self.queue_size, 1)) for _ in range(3))
+        await asyncio.gather(
+            self.ingest(paths, raw),
+            self.stage("extract", self.extract, raw, stats, workers=extract_workers),
+            self.stage("render", self.render, stats, pdfs),
+            self.stage("write", self.write, pdfs),
+        )
+
+
+def main(argv=None):
+    load_plugins()
+    settings = load_settings()
+    parser = argparse.ArgumentParser(description="Build GPT Wrapped PDFs for many exports")
+    parser.add_argument("exports", nargs="+", help="conversations.json exports")
+    parser.add_argument("--out-dir", default="wraps", help="where to save the PDFs (default: wraps)")
+    parser.add_argument("--start", default=settings["START"], help="first day of the wraps, YYYY-MM-DD")
+    parser.add_argument("--end", default=settings["END"], help="day after the last day of the wraps, YYYY-MM-DD")
+    parser.add_argument("--year", type=int, help="wrap a whole calendar year")
+    parser.add_argument("--tz", default=settings["TIMEZONE"], help="timezone, e.g. America/New_York")
+    parser.add_argument("--with", dest="optional", action="append", default=[],
+                        choices=optional_pages(),
+                        help="add an optional page or use a page variant")
+    parser.add_argument("--exclude-code", action="store_true",
+                        help="leave code blocks out of the top words")
+    parser.add_argument("--incremental", action="store_true",
+                        help="append the pages to an unchanged copy of the template")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, metavar="N",
+                        help="worker processes for extracting and rendering (default: one per CPU)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, metavar="N",
+                        help=f"wraps waiting between two stages, at most (default: {QUEUE_SIZE})")
+    args = parser.parse_args(argv)
+    if args.year:
+        args.start, args.end = year_range(args.year)
+    options = {"start": args.start, "end": args.end, "tz": args.tz,
+               "exclude_code": args.exclude_code, "word_memory_limit": settings["WORD_MEMORY_LIMIT"]}
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    print("=" * 60)
+    print(f"GPT WRAPPED - BATCH OF {len(args.exports)}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    start_tracker()
+    with ProcessPoolExecutor(args.jobs, initializer=load_plugins) as pool:
+        pipeline = Pipeline(pool, options, select_pages(args.optional), args.out_dir,
+                            args.incremental, args.queue_size)
+        # Extractions are single threaded, so run up to one per worker; a
+        # user's pages are rendered in parallel already
+        asyncio.run(pipeline.run(args.exports, extract_workers=args.jobs))
+    elapsed = time.perf_counter() - started
+
+    print("\n" + "=" * 60)
+    print(f"{len(pipeline.written)} wraps in {elapsed:.1f}s"
+          + (f", {len(pipeline.failed)} failed" if pipeline.failed else ""))
+    print("   Time spent in each stage (overlapping):")
+    for name, seconds in pipeline.busy.items():
+        print(f"      {name:<8}{seconds:7.1f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading the export
+
+Writes synthetic exports of a few sizes (see synthetic_export.py) and loads
+each one the old way - json.load() on a file object - and through every
+installed JSON backend (see json_backend.py), which memory-map the file.
+Each load runs in a fresh process, so the peak memory reported is that
+load's alone: the growth in peak resident memory. For the backends, that
+counts the pages of the memory-mapped file, which are the same page cache
+a read() fills (just not counted against the process) and which the OS can
+drop at any time; the last column leaves them out.
+
+    python benchmark_json.py [--sizes 2000 10000 40000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from json_backend import available_backends, load_json
+from synthetic_export import write_export
+
+# How each method loads a file
+OLD_WAY = "json.load (file)"
+
+
+def load(method, path):
+    if method == OLD_WAY:
+        with open(path, "r") as f:
+            return json.load(f)
+    return load_json(path, method)
+
+
+def peak_memory():
+    """Peak resident memory of this process so far, in bytes."""
+    try:
+        # Linux: unlike getrusage(), not inherited from the parent process
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure(method, path, repeat):
+    """(best seconds, peak memory growth in bytes or None) for one method."""
+    try:
+        before = peak_memory()
+    except ImportError:
+        # No resource module (Windows): time only
+        before = None
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conversations = load(method, path)
+        times.append(time.perf_counter() - started)
+        del conversations
+    growth = peak_memory() - before if before is not None else None
+    return min(times), growth
+
+
+def measure_in_subprocess(method, path, repeat):
+    output = subprocess.run([sys.executable, __file__, "--measure", method, path,
+                             "--repeat", str(repeat)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ways of loading the export")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000, 40000],
+                        help="conversations in each synthetic export")
+    parser.add_argument("--repeat", type=int, default=3, help="loads of each (best is kept)")
+    parser.add_argument("--measure", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure, args.repeat)))
+        return
+
+    methods = [OLD_WAY] + available_backends()
+    print(f"Loading synthetic exports (best of {args.repeat}):")
+    print(f"   {'conversations':>13}{'MB':>8}  {'method':<18}{'seconds':>9}{'MB/s':>8}{'peak MB':>9}"
+          f"{'w/o map':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = write_export(os.path.join(tmp, f"export_{size}.json"), size)
+            megabytes = os.path.getsize(path) / 2 ** 20
+            for method in methods:
+                seconds, growth = measure_in_subprocess(method, path, args.repeat)
+                if growth is None:
+                    peak = unmapped = f"{'-':>9}"
+                else:
+                    peak = f"{growth / 2 ** 20:9.0f}"
+                    mapped = 0 if method == OLD_WAY else megabytes
+                    unmapped = f"{growth / 2 ** 20 - mapped:9.0f}"
+                print(f"   {size:>13,}{megabytes:8.1f}  {method:<18}{seconds:9.3f}"
+                      f"{megabytes / seconds:8.0f}{peak}{unmapped}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
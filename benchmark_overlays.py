@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: applying overlays to the template
+
+Renders every page overlay once, then puts them on the template both ways
+- pypdf's merge_page() and the Form XObject stamping compile_pdf.py uses
+(see pdf_overlay.py) - and reports how long each step takes and how big
+the resulting PDF is.
+
+Needs extracted_data.pkl, so run data_extractor.py first:
+    python benchmark_overlays.py [--repeat 5]
+"""
+import argparse
+import time
+from io import BytesIO
+from pypdf import PdfReader, PdfWriter
+
+from compile_pdf import INPUT_PDF
+from page_registry import select_pages
+from pdf_overlay import merge_overlay, overlay_page, stamp_overlay
+
+
+def render_all():
+    """{page number: overlay bytes}, timing the render and the parse back."""
+    overlays = {}
+    render_time = parse_time = 0
+    for page_num, page in select_pages()[0].items():
+        started = time.perf_counter()
+        overlays[page_num] = page.render().getvalue()
+        render_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        overlay_page(overlays[page_num]).get_contents().operations
+        parse_time += time.perf_counter() - started
+    return overlays, render_time, parse_time
+
+
+def compose(overlays, method):
+    """(seconds to apply, seconds to write, PDF size) for one way of merging."""
+    started = time.perf_counter()
+    reader = PdfReader(INPUT_PDF)
+    writer = PdfWriter()
+    for i, page in enumerate(reader.pages):
+        page_num = i + 1
+        if method == "merge_page":
+            if page_num in overlays:
+                merge_overlay(page, overlays[page_num])
+            writer.add_page(page)
+        else:
+            page = writer.add_page(page)
+            if page_num in overlays:
+                stamp_overlay(writer, page, overlays[page_num])
+    applied = time.perf_counter()
+
+    output = BytesIO()
+    writer.write(output)
+    written = time.perf_counter()
+    return applied - started, written - applied, len(output.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ways of applying overlays")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each method (best is kept)")
+    args = parser.parse_args()
+
+    print("Rendering overlays...")
+    overlays, render_time, parse_time = render_all()
+    print(f"   Page modules (render + save):  {render_time * 1000:8.1f} ms")
+    print(f"   Parsing them back:             {parse_time * 1000:8.1f} ms")
+
+    print(f"\nApplying {len(overlays)} overlays (best of {args.repeat}):")
+    print(f"   {'method':<14}{'apply ms':>10}{'write ms':>10}{'total ms':>10}{'size KB':>10}")
+    for method in ("merge_page", "form_xobject"):
+        runs = [compose(overlays, method) for _ in range(args.repeat)]
+        apply_time, write_time, size = min(runs, key=lambda run: run[0] + run[1])
+        print(f"   {method:<14}{apply_time * 1000:10.1f}{write_time * 1000:10.1f}"
+              f"{(apply_time + write_time) * 1000:10.1f}{size / 1024:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Build Graph
+
+Keeps track of what each step of building the PDF depended on last time,
+so compile_pdf.py only redoes the steps whose inputs changed:
+
+- extraction depends on the export file, config.txt, the extractor options
+  and the source of data_extractor.py and every local module it imports
+- each page's overlay depends on the stats fields the page declares in its
+  FIELDS tuple and the source of the page module (plus its local imports)
+- the final PDF depends on the template and every overlay
+
+Inputs are fingerprinted with SHA-1. Files that haven't been touched (same
+size and modification time) reuse their last hash, so checking a big export
+is instant. Everything lives in .build_cache/: a JSON manifest of hashes and
+the rendered overlays.
+"""
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+
+# This project's modules live next to this file
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CACHE_DIR = ".build_cache"
+MANIFEST = "manifest.json"
+
+# Pages without a FIELDS tuple depend on every stat
+ALL_FIELDS = None
+
+
+def digest(*parts):
+    """SHA-1 of strings/bytes, in order."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def local_path(module_name):
+    """Source file of one of this project's modules, or None."""
+    path = os.path.join(PROJECT_DIR, f"{module_name}.py")
+    return path if os.path.exists(path) else None
+
+
+def module_path(module_name):
+    """Source file of a module: this project's, or wherever it's installed."""
+    path = local_path(module_name)
+    if path is not None:
+        return path
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    return spec.origin
+
+
+def local_imports(path):
+    """Names of modules imported by a source file, from its import statements."""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def declared_fields(path):
+    """The FIELDS tuple of a page module, read without importing it."""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == "FIELDS"):
+            return tuple(ast.literal_eval(node.value))
+    return ALL_FIELDS
+
+
+class BuildCache:
+    """Fingerprints of the last build and the overlays it rendered."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST)
+        try:
+            with open(self.manifest_path, "r") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.manifest.setdefault("files", {})
+        self.manifest.setdefault("steps", {})
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def file_digest(self, path):
+        """SHA-1 of a file's contents, rehashed only if its size or mtime changed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing"
+        known = self.manifest["files"].get(path)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["sha1"]
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        self.manifest["files"][path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                        "sha1": h.hexdigest()}
+        return h.hexdigest()
+
+    def source_digest(self, module_name):
+        """
+        Hash of a module's source and, recursively, the modules of this
+        project it imports.
+        """
+        seen = set()
+        pending = [(module_name, module_path(module_name))]
+        hashes = []
+        while pending:
+            name, path = pending.pop()
+            if name in seen or path is None:
+                continue
+            seen.add(name)
+            hashes.append(f"{name}:{self.file_digest(path)}")
+            pending.extend((imported, local_path(imported)) for imported in local_imports(path))
+        return digest(*sorted(hashes))
+
+    def stats_fields(self, path):
+        """
+        (per-field hashes, draft info or None) for an extracted data file,
+        remembered so an unchanged file isn't unpickled again.
+        """
+        key = self.file_digest(path)
+        known = self.manifest.get("stats")
+        if known and known["key"] == key:
+            return known["fields"], known["draft"]
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        fields = field_digests(data)
+        # Through JSON so it's the same whether it came from here or the manifest
+        draft = json.loads(json.dumps(data.get("draft")))
+        self.manifest["stats"] = {"key": key, "fields": fields, "draft": draft}
+        return fields, draft
+
+    def is_fresh(self, step, key):
+        return self.manifest["steps"].get(step) == key
+
+    def record(self, step, key):
+        self.manifest["steps"][step] = key
+
+    def overlay_path(self, page_name):
+        return os.path.join(self.cache_dir, f"{page_name}.pdf")
+
+    def load_overlay(self, page_name, key):
+        """Cached overlay bytes if they were rendered from the same inputs."""
+        if not self.is_fresh(f"page:{page_name}", key):
+            return None
+        try:
+            with open(self.overlay_path(page_name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store_overlay(self, page_name, key, overlay):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.overlay_path(page_name), "wb") as f:
+            f.write(overlay)
+        self.record(f"page:{page_name}", key)
+
+
+def field_digests(data):
+    """Per-field hashes of the extracted stats."""
+    return {name: digest(pickle.dumps(value, protocol=4)) for name, value in data.items()}
+
+
+def page_key(cache, page, fields):
+    """Fingerprint of everything a page overlay is rendered from (see page_registry.py)."""
+    wanted = page.fields
+    if wanted is ALL_FIELDS:
+        wanted = sorted(fields)
+    return digest(cache.source_digest(page.module), page.function,
+                  *(f"{name}={fields.get(name, 'missing')}" for name in wanted))
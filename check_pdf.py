@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Check PDF
+
+Opens a finished wrap with every PDF reader it can find and reports whether
+each one could read all of its pages. Useful after building with
+--incremental, whose output relies on readers following the update
+section appended to the template.
+
+- pypdf, in strict mode (always available)
+- PDFium, the engine in Chrome and Edge (if pypdfium2 is installed)
+- qpdf, MuPDF, Poppler (Evince, Okular, ...) and Ghostscript, if their
+  command line tools are on your PATH
+
+Usage:
+    python check_pdf.py gpt_wrapped_2025_final.pdf
+    python check_pdf.py gpt_wrapped_2025_final.pdf --template GPT_WRAPPED_TEMPLATE.pdf
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from pypdf import PdfReader
+
+# Command line readers: name -> (program, arguments before the file)
+EXTERNAL_READERS = {
+    "qpdf": ("qpdf", ["--check"]),
+    "MuPDF": ("mutool", ["draw", "-o", os.devnull]),
+    "Poppler": ("pdftoppm", ["-r", "10"]),
+    "Ghostscript": ("gs", ["-q", "-dNOPAUSE", "-dBATCH", "-dSAFER", "-sDEVICE=nullpage"]),
+}
+
+
+def check_pypdf(path):
+    reader = PdfReader(path, strict=True)
+    for page in reader.pages:
+        page.get_contents()
+        page.extract_text()
+    return f"{len(reader.pages)} pages"
+
+
+def check_pdfium(path):
+    import pypdfium2
+    document = pypdfium2.PdfDocument(path)
+    for page in document:
+        page.render(scale=0.1)
+    return f"{len(document)} pages"
+
+
+def check_external(program, arguments, path):
+    if program == "pdftoppm":
+        # pdftoppm wants an output prefix after the file; render to a temp dir
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run([program, *arguments, path, os.path.join(tmp, "page")],
+                                    capture_output=True, text=True)
+    else:
+        result = subprocess.run([program, *arguments, path], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError((result.stderr or result.stdout).strip().splitlines()[-1:] or "failed")
+    return "ok"
+
+
+def starts_with(path, template_path):
+    """Whether the file begins with an unchanged copy of the template."""
+    size = os.path.getsize(template_path)
+    with open(path, "rb") as f, open(template_path, "rb") as template:
+        return os.path.getsize(path) > size and f.read(size) == template.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that PDF readers can open a wrap")
+    parser.add_argument("pdf")
+    parser.add_argument("--template", help="also check the PDF is an update of this template")
+    args = parser.parse_args()
+
+    checks = [("pypdf", lambda: check_pypdf(args.pdf))]
+    try:
+        import pypdfium2  # noqa: F401
+        checks.append(("PDFium", lambda: check_pdfium(args.pdf)))
+    except ImportError:
+        print("   PDFium: skipped (pip install pypdfium2)")
+    for name, (program, arguments) in EXTERNAL_READERS.items():
+        if shutil.which(program):
+            checks.append((name, lambda program=program, arguments=arguments:
+                           check_external(program, arguments, args.pdf)))
+        else:
+            print(f"   {name}: skipped ({program} not found)")
+
+    failed = False
+    if args.template:
+        if starts_with(args.pdf, args.template):
+            print(f"   Template: unchanged, {os.path.getsize(args.pdf) - os.path.getsize(args.template):,} "
+                  f"bytes appended")
+        else:
+            print("   Template: FAILED - the file doesn't start with the template")
+            failed = True
+
+    for name, check in checks:
+        try:
+            print(f"   {name}: {check()}")
+        except Exception as e:
+            print(f"   {name}: FAILED - {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
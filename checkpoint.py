@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Checkpoints
+
+Saves a long extraction's progress every so often, so a crash or a timeout
+near the end of a huge export doesn't throw the work away. The export is
+streamed (see ExportReader in wrapped_stats.py) and, between
+conversations, everything extracted so far - the running totals and
+counters, the per-day stats, word counts (including any spilled to disk),
+sketches, the prompt index - is pickled together with the byte offset
+reached in the export into one gzip-compressed file. --resume loads it,
+skips straight to that offset and carries on; the stats come out exactly
+as they would have from one uninterrupted run.
+
+A checkpoint is only resumed for the same export (same size and
+modification time) and the same settings; otherwise it's an error rather
+than a silently wrong wrap. It's deleted once the extraction finishes.
+
+    python3 data_extractor.py --checkpoint
+    python3 data_extractor.py --resume        # after an interruption
+"""
+import gzip
+import os
+import pickle
+import time
+
+from daily_stats import DailyStats, count_conversation
+from timezones import period_bounds
+from wrapped_stats import Extraction, ExportReader, in_period
+
+CHECKPOINT_FILE = "extract_checkpoint.pkl.gz"
+
+# Seconds between checkpoints
+CHECKPOINT_INTERVAL = 60
+
+# Conversations in the period added to the extraction at a time
+BATCH_SIZE = 500
+
+
+class ExtractionState:
+    """Everything a checkpoint holds: where the export was read to, and the totals so far."""
+
+    def __init__(self, export, settings, extraction, daily):
+        self.export = export
+        self.settings = settings
+        self.extraction = extraction
+        self.daily = daily
+        self.offset = 0
+        self.conversations_read = 0
+
+
+def export_signature(path):
+    """(size, modification time) of the export, to tell if it changed."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def save_checkpoint(state, path=CHECKPOINT_FILE):
+    """Write a checkpoint (via a temporary file, so a crash mid-save keeps the last one)."""
+    with gzip.open(path + ".tmp", "wb", compresslevel=1) as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+def load_checkpoint(path=CHECKPOINT_FILE):
+    with gzip.open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def extract_with_checkpoints(export_path, checkpoint_path=CHECKPOINT_FILE, resume=False,
+                             interval=CHECKPOINT_INTERVAL, index=None, start=None, end=None,
+                             tz=None, topic_cache_key=None, **options):
+    """
+    Stream the export and extract the stats for [start, end), saving a
+    checkpoint every `interval` seconds. With resume, carry on from the
+    checkpoint at checkpoint_path. options are Extraction's (session_gap,
+    dup_threshold, exclude_code, word_memory_limit); no SQLite sink.
+
+    Returns (stats dict, finalized DailyStats for the whole export, prompt
+    index or None).
+    """
+    settings = {"start": start, "end": end, "tz": getattr(tz, "key", tz),
+                "index": index is not None, "topic_cache_key": topic_cache_key, **options}
+    export = export_signature(export_path)
+    if resume:
+        if not os.path.exists(checkpoint_path):
+            raise ValueError(f"no checkpoint at {checkpoint_path} to resume from")
+        state = load_checkpoint(checkpoint_path)
+        if state.export != export:
+            raise ValueError(f"{checkpoint_path} is for a different version of the export; "
+                             "delete it or run without --resume")
+        if state.settings != settings:
+            raise ValueError(f"{checkpoint_path} was made with different settings; "
+                             "delete it or run without --resume")
+        print(f"Resuming from {checkpoint_path}: {state.conversations_read:,} conversations "
+              f"already done ({state.offset / max(export[0], 1):.0%} of the export)")
+    else:
+        state = ExtractionState(export, settings, Extraction(index, tz=tz, **options),
+                                DailyStats(tz))
+
+    bounds = period_bounds(start, end, tz)
+    reader = ExportReader(export_path, offset=state.offset)
+    batch = []
+    last_saved = time.monotonic()
+    for conversation in reader:
+        # Per-day totals cover the whole export (see daily_stats.py)
+        count_conversation(state.daily, conversation)
+        state.conversations_read += 1
+        if in_period(conversation, bounds):
+            batch.append(conversation)
+            if len(batch) >= BATCH_SIZE:
+                state.extraction.add(batch)
+                batch = []
+
+        if time.monotonic() - last_saved >= interval:
+            if batch:
+                state.extraction.add(batch)
+                batch = []
+            state.offset = reader.tell()
+            save_checkpoint(state, checkpoint_path)
+            last_saved = time.monotonic()
+            print(f"   Checkpoint: {state.conversations_read:,} conversations "
+                  f"({state.offset / max(export[0], 1):.0%} of the export)")
+    if batch:
+        state.extraction.add(batch)
+
+    print(f"Loaded {state.extraction.conversations} conversations from the period")
+    data = state.extraction.results(start, end, topic_cache_key)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return data, state.daily.finalize(), state.extraction.index
@@ -6,94 +6,354 @@ This script combines the template PDF with dynamically generated overlays
 for each page to create the final personalized GPT Wrapped report.
 """
 from pypdf import PdfReader, PdfWriter
-import importlib.util
+from reportlab.pdfgen import canvas
+from reportlab.lib.colors import Color
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import glob
+import importlib
+import os
+import pickle
+import subprocess
 import sys
+import time
+
+from build_graph import BuildCache, digest, page_key
+from incremental_pdf import open_template, write_update
+from page_registry import get_page, load_plugins, optional_pages, select_pages
+from pdf_overlay import stamp_overlay
+from settings import load_config
+from shared_stats import SharedStats, attach_stats
 
 # Configuration
 INPUT_PDF = "GPT_WRAPPED_TEMPLATE.pdf"
 OUTPUT_PDF = "gpt_wrapped_2025_final.pdf"
+DATA_PICKLE = "extracted_data.pkl"
+
+# Where the exact run saves its data while a draft is on screen
+EXACT_DATA = "extracted_data.exact.pkl"
+
+# Seconds between checks for changed files in --watch mode
+WATCH_INTERVAL = 0.2
+
+
+def render_page(page):
+    """(overlay PDF bytes or None, error message or None) for a registered page."""
+    try:
+        return page.render().getvalue(), None
+    except Exception as e:
+        return None, str(e)
+
+
+def start_worker(descriptor):
+    """Pool initializer: plugin pages and the shared stats for this worker."""
+    load_plugins()
+    attach_stats(descriptor)
 
-# Maps page numbers to their corresponding overlay modules
-PAGE_MODULES = {
-    3: "page3_words",
-    4: "page4_streak",
-    5: "page5_top_words",
-    6: "page6_pie_chart",
-    7: "page7_longest_chat",
-    8: "page8_monthly_chart",
-    9: "page9_heatmap",
-    10: "page10_prompts",
-    11: "page11_persona",
-    12: "page12_summary",
-}
-
-
-def load_module(module_name):
+
+def render_in_worker(page_name):
+    return render_page(get_page(page_name))
+
+
+def render_overlays(pages, cache, fields, force=False, jobs=1):
     """
-    Dynamically import and return a Python module by name.
-    This allows us to load page overlay modules at runtime.
+    {page name: overlay PDF bytes} for registered pages, re-rendering only
+    those whose source or stats changed since they were last cached (so
+    the others' modules aren't even imported). A page that failed to
+    render gets None. With jobs > 1, pages are rendered in that many
+    worker processes, which share one copy of the stats (see
+    shared_stats.py).
     """
-    spec = importlib.util.spec_from_file_location(module_name, f"{module_name}.py")
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[module_name] = module
-    spec.loader.exec_module(module)
-    return module
+    keys = {page.name: page_key(cache, page, fields) for page in pages}
+    overlays = {}
+    stale = []
+    for page in pages:
+        overlays[page.name] = None if force else cache.load_overlay(page.name, keys[page.name])
+        if overlays[page.name] is not None:
+            print(f"   {page.name}: unchanged, using cached overlay")
+        else:
+            print(f"   {page.name}: rendering...")
+            stale.append(page)
+
+    if jobs > 1 and len(stale) > 1:
+        with open(DATA_PICKLE, "rb") as f:
+            data = pickle.load(f)
+        with SharedStats(data) as shared:
+            del data
+            with ProcessPoolExecutor(min(jobs, len(stale)), initializer=start_worker,
+                                     initargs=(shared.descriptor,)) as pool:
+                results = list(pool.map(render_in_worker, [page.name for page in stale]))
+    else:
+        results = [render_page(page) for page in stale]
+
+    for page, (overlay, error) in zip(stale, results):
+        if error is not None:
+            print(f"   {page.name}: Error - {error}")
+            continue
+        cache.store_overlay(page.name, keys[page.name], overlay)
+        overlays[page.name] = overlay
+    return overlays
+
 
+def add_extra_pages(writer, width, height, overlays, index, log=print):
+    """Put each extra page overlay onto a new blank page, from page index on."""
+    for page_name, overlay in overlays:
+        if overlay is None:
+            continue
+        writer.insert_blank_page(width=width, height=height, index=index)
+        # insert_blank_page() returns a detached copy; stamp the page in the writer
+        stamp_overlay(writer, writer.pages[index], overlay)
+        index += 1
+        log(f"   Extra page: {page_name} added")
+
+
+def main(argv=None):
+    load_plugins()
+    parser = argparse.ArgumentParser(description="Build your GPT Wrapped PDF")
+    parser.add_argument("--start", help="first day of the wrap, YYYY-MM-DD")
+    parser.add_argument("--end", help="day after the last day of the wrap, YYYY-MM-DD")
+    parser.add_argument("--year", type=int, help="wrap a whole calendar year")
+    parser.add_argument("--output", help=f"output PDF (default: {OUTPUT_PDF})")
+    parser.add_argument("--tz", help="your timezone, e.g. America/New_York")
+    parser.add_argument("--with", dest="optional", action="append", default=[],
+                        choices=optional_pages(),
+                        help="add an optional page or use a page variant")
+    parser.add_argument("--exclude-code", action="store_true",
+                        help="leave code blocks out of your top words")
+    parser.add_argument("--draft", action="store_true",
+                        help="show a quick estimate from a sample first, then replace it with the exact PDF")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild everything, even steps whose inputs haven't changed")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild whenever the export or a page module changes")
+    parser.add_argument("--incremental", action="store_true",
+                        help="append your pages to an unchanged copy of the template instead of rewriting it")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="render pages in N worker processes")
+    args = parser.parse_args(argv)
+    overlay_pages, extra_pages = select_pages(args.optional)
+
+    output_pdf = args.output or (f"gpt_wrapped_{args.year}_final.pdf" if args.year else OUTPUT_PDF)
+    extractor_args = []
+    for option in ("start", "end", "year", "tz"):
+        if getattr(args, option):
+            extractor_args += [f"--{option}", str(getattr(args, option))]
+    if args.exclude_code:
+        extractor_args.append("--exclude-code")
 
-def main():
     print("=" * 60)
-    print("GPT WRAPPED 2025 - PDF COMPILER")
+    print("GPT WRAPPED - PDF COMPILER")
     print("=" * 60)
-    
-    # Step 1: Extract analytics data from the conversations file
-    print("\nStep 1: Extracting data from conversations...")
-    extractor = load_module("data_extractor")
-    extractor.main()
-    
-    # Step 2: Load the template PDF
-    print(f"\nStep 2: Opening template PDF...")
-    reader = PdfReader(INPUT_PDF)
-    writer = PdfWriter()
-    print(f"   Template has {len(reader.pages)} pages")
-    
-    # Step 3: Generate and apply overlays for each page
-    print(f"\nStep 3: Creating and applying overlays...")
-    
-    for i, page in enumerate(reader.pages):
+
+    cache = BuildCache()
+    build(cache, extractor_args, overlay_pages, extra_pages, output_pdf,
+          draft=args.draft, force=args.force, incremental=args.incremental, jobs=args.jobs)
+
+    if args.watch:
+        watch(cache, extractor_args, overlay_pages, extra_pages, output_pdf, args.incremental,
+              args.jobs)
+
+
+def build(cache, extractor_args, overlay_pages, extra_pages, output_pdf, draft=False, force=False,
+          incremental=False, jobs=1):
+    """Extract (if the inputs changed) and build the PDF."""
+    # Step 1: Extract analytics data from the conversations file, unless
+    # nothing it depends on has changed since last time
+    extract_key = digest(cache.file_digest(load_config()), cache.file_digest("config.txt"),
+                         cache.source_digest("data_extractor"), *extractor_args)
+    if not force and cache.is_fresh("extract", extract_key) and os.path.exists(DATA_PICKLE):
+        print("\nStep 1: Export and settings unchanged, reusing extracted data")
+    elif draft:
+        # Start the exact extraction in the background, render a draft from
+        # a sample meanwhile, then swap in the exact version when it's done
+        print("\nStep 1: Extracting a quick draft (exact run continues in the background)...")
+        extractor_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_extractor.py")
+        exact = subprocess.Popen([sys.executable, extractor_script, *extractor_args,
+                                  "--output", EXACT_DATA],
+                                 stdout=subprocess.DEVNULL)
+        extractor = importlib.import_module("data_extractor")
+        extractor.main(extractor_args + ["--sample"])
+        build_pdf(cache, overlay_pages, extra_pages, output_pdf, force, incremental, jobs)
+
+        print("\nWaiting for the exact extraction to finish...")
+        if exact.wait() != 0:
+            print(f"   Exact extraction failed, keeping the draft in {output_pdf}")
+            return
+        os.replace(EXACT_DATA, DATA_PICKLE)
+        cache.record("extract", extract_key)
+        print("\nExact data ready, replacing the draft...")
+    else:
+        print("\nStep 1: Extracting data from conversations...")
+        extractor = importlib.import_module("data_extractor")
+        extractor.main(extractor_args)
+        cache.record("extract", extract_key)
+
+    build_pdf(cache, overlay_pages, extra_pages, output_pdf, force, incremental, jobs)
+
+
+def compose_pdf(template_overlays, extra_overlays, draft=None, incremental=False, log=print):
+    """
+    A PdfWriter holding the template with the overlays applied:
+    template_overlays maps page numbers to overlay bytes (None for a page
+    that failed to render), extra_overlays is a list of (page name,
+    overlay bytes) inserted before the closing page.
+    """
+    if incremental:
+        # Changes are recorded as an update to the template (see incremental_pdf.py)
+        writer = open_template(INPUT_PDF)
+        template_pages = list(writer.pages)
+    else:
+        writer = PdfWriter()
+        template_pages = [writer.add_page(page) for page in PdfReader(INPUT_PDF).pages]
+    log(f"   Template has {len(template_pages)} pages")
+
+    # Overlays are drawn onto the writer's copy of each page as Form
+    # XObjects (see pdf_overlay.py), so the template isn't reparsed
+    for i, page in enumerate(template_pages):
         page_num = i + 1
-        
-        if page_num in PAGE_MODULES:
-            module_name = PAGE_MODULES[page_num]
-            print(f"   Page {page_num}: Loading {module_name}...")
-            
-            try:
-                module = load_module(module_name)
-                overlay_bytes = module.create_overlay()
-                overlay_reader = PdfReader(overlay_bytes)
-                
-                if len(overlay_reader.pages) > 0:
-                    page.merge_page(overlay_reader.pages[0])
-                    print(f"   Page {page_num}: Overlay applied successfully")
+        if page_num in template_overlays:
+            overlay = template_overlays[page_num]
+            if overlay is not None:
+                if stamp_overlay(writer, page, overlay):
+                    log(f"   Page {page_num}: Overlay applied successfully")
                 else:
-                    print(f"   Page {page_num}: Warning - empty overlay")
-            except Exception as e:
-                print(f"   Page {page_num}: Error - {e}")
+                    log(f"   Page {page_num}: Warning - empty overlay")
         else:
-            print(f"   Page {page_num}: No overlay needed")
-        
-        writer.add_page(page)
-    
-    # Step 4: Write the final PDF to disk
-    print(f"\nStep 4: Saving to {OUTPUT_PDF}...")
-    with open(OUTPUT_PDF, "wb") as f:
-        writer.write(f)
+            log(f"   Page {page_num}: No overlay needed")
+
+    # Extra pages go in before the closing page
+    closing = template_pages[-1]
+    add_extra_pages(writer, float(closing.mediabox.width), float(closing.mediabox.height),
+                    extra_overlays, index=len(writer.pages) - 1, log=log)
+
+    if draft:
+        first = writer.pages[0]
+        stamp = draft_stamp(float(first.mediabox.width), float(first.mediabox.height), draft)
+        for page in writer.pages:
+            stamp_overlay(writer, page, stamp)
+    return writer
+
+
+def build_pdf(cache, overlay_pages, extra_pages, output_pdf, force=False, incremental=False,
+              jobs=1):
+    """Apply every overlay to the template and save the PDF."""
+    fields, draft = cache.stats_fields(DATA_PICKLE)
+
+    # Step 2: Render the overlays whose inputs changed
+    print(f"\nStep 2: Creating overlays...")
+    overlays = render_overlays(list(overlay_pages.values()) + extra_pages, cache, fields,
+                               force, jobs)
+
+    # Nothing to write if the template and every overlay are the same as
+    # in the PDF already on disk
+    output_key = digest(cache.file_digest(INPUT_PDF), draft, incremental,
+                        *(f"{page_num}:{page.name}" for page_num, page in sorted(overlay_pages.items())),
+                        *(page.name for page in extra_pages),
+                        *(digest(overlay or b"") for overlay in overlays.values()))
+    if not force and cache.is_fresh(f"output:{output_pdf}", output_key) and os.path.exists(output_pdf):
+        print(f"\n{output_pdf} is up to date")
+        cache.save()
+        return
+
+    # Step 3: Apply the overlays to the template
+    print(f"\nStep 3: Applying overlays to the template...")
+    writer = compose_pdf({page_num: overlays[page.name] for page_num, page in overlay_pages.items()},
+                         [(page.name, overlays[page.name]) for page in extra_pages],
+                         draft, incremental)
+
+    # Step 4: Write the final PDF to disk (via a temporary file, so a draft
+    # is replaced in one step and never seen half-written)
+    print(f"\nStep 4: Saving to {output_pdf}...")
+    if incremental:
+        write_update(writer, INPUT_PDF, output_pdf + ".tmp")
+    else:
+        with open(output_pdf + ".tmp", "wb") as f:
+            writer.write(f)
+    os.replace(output_pdf + ".tmp", output_pdf)
+    cache.record(f"output:{output_pdf}", output_key)
+    cache.save()
     
     print("\n" + "=" * 60)
-    print("GPT WRAPPED 2025 PDF COMPLETE!")
-    print(f"   Output: {OUTPUT_PDF}")
+    print("GPT WRAPPED DRAFT READY!" if draft else "GPT WRAPPED PDF COMPLETE!")
+    print(f"   Output: {output_pdf}")
     print("=" * 60)
 
 
+def watched_files():
+    """Modification times of everything a build reads."""
+    paths = [load_config(), "config.txt", INPUT_PDF] + glob.glob("*.py")
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def forget_local_modules():
+    """Drop this project's modules from sys.modules so edits are picked up."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name != __name__ and path and os.path.dirname(os.path.abspath(path)) == here:
+            del sys.modules[name]
+
+
+def watch(cache, extractor_args, overlay_pages, extra_pages, output_pdf, incremental=False,
+          jobs=1):
+    """Rebuild whenever a watched file changes, until Ctrl+C."""
+    print("\nWatching for changes (Ctrl+C to stop)...")
+    seen = watched_files()
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = watched_files()
+            if current == seen:
+                continue
+            changed = sorted(path for path in current if current[path] != seen.get(path))
+            seen = current
+            print(f"\nChanged: {', '.join(changed)}")
+            started = time.perf_counter()
+            forget_local_modules()
+            try:
+                build(cache, extractor_args, overlay_pages, extra_pages, output_pdf,
+                      incremental=incremental, jobs=jobs)
+            except Exception as e:
+                print(f"   Build failed - {e}")
+                continue
+            print(f"   Rebuilt in {time.perf_counter() - started:.2f}s")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def draft_stamp(width, height, draft):
+    """A page with a faint diagonal DRAFT mark and a note on the sampling."""
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=(width, height))
+
+    c.saveState()
+    c.setFillColor(Color(1, 1, 1, alpha=0.18))
+    c.setFont("Helvetica-Bold", 220)
+    c.translate(width / 2, height / 2)
+    c.rotate(60)
+    c.drawCentredString(0, -70, "DRAFT")
+    c.restoreState()
+
+    c.setFillColor(Color(0, 0, 0, alpha=0.55))
+    c.roundRect(width / 2 - 300, height - 70, 600, 44, 22, fill=True, stroke=False)
+    c.setFillColor(Color(1, 1, 1))
+    c.setFont("Helvetica-Bold", 18)
+    c.drawCentredString(width / 2, height - 55,
+                        f"DRAFT \u2022 ESTIMATED FROM {draft['sample_size']:,} OF "
+                        f"{draft['population']:,} CHATS")
+
+    c.save()
+    packet.seek(0)
+    return PdfReader(packet).pages[0]
+
+
 if __name__ == "__main__":
     main()
 
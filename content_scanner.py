@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Content Scanner
+
+Looks at what's inside each message besides plain prose, in the same pass
+as the rest of the extraction:
+
+- fenced code blocks (```python ... ```), counted by language, and how many
+  lines of code you sent ("requested") vs. GPT sent back ("received")
+- code interpreter messages, whose code lives outside the text parts
+- images, audio and other non-text parts, counted by their content_type,
+  plus files attached to messages
+
+Optionally the code is cut out of the text that feeds the word counts, so
+identifiers like "self" and "return" don't crowd out your real top words.
+"""
+import re
+from collections import Counter
+
+# ```lang ... ``` up to the closing fence (or the end of an unclosed block)
+FENCE = re.compile(r"^[ \t]*```[ \t]*([^\s`]*)[^\n]*\n(.*?)(?:^[ \t]*```[ \t]*$|\Z)",
+                   re.MULTILINE | re.DOTALL)
+
+# Fence labels that mean the same language
+LANGUAGE_ALIASES = {
+    "py": "python", "python3": "python",
+    "js": "javascript", "jsx": "javascript", "node": "javascript",
+    "ts": "typescript", "tsx": "typescript",
+    "sh": "bash", "shell": "bash", "zsh": "bash", "console": "bash",
+    "c++": "cpp", "cc": "cpp", "hpp": "cpp",
+    "cs": "csharp", "c#": "csharp",
+    "rb": "ruby", "rs": "rust", "golang": "go", "kt": "kotlin",
+    "yml": "yaml", "md": "markdown", "htm": "html",
+    "postgresql": "sql", "mysql": "sql", "sqlite": "sql",
+    "txt": "plain", "text": "plain", "plaintext": "plain", "unknown": "plain",
+}
+
+# Non-text parts grouped the way the page shows them
+MEDIA_KINDS = {
+    "image_asset_pointer": "images",
+    "audio_asset_pointer": "audio",
+    "real_time_user_audio_video_asset_pointer": "audio",
+    "audio_transcription": "audio",
+    "video_container_asset_pointer": "video",
+}
+
+
+def normalize_language(label):
+    """Canonical language name for a fence label ('' becomes 'plain')."""
+    label = label.lower().strip("{}.")
+    return LANGUAGE_ALIASES.get(label, label) or "plain"
+
+
+def count_lines(code):
+    """Non-blank lines in a block of code."""
+    return sum(1 for line in code.splitlines() if line.strip())
+
+
+class ContentScanner:
+    """Counts code blocks, code lines and non-text parts message by message."""
+
+    def __init__(self, exclude_code=False):
+        self.exclude_code = exclude_code
+        self.languages = Counter()
+        self.lines_requested = 0
+        self.lines_received = 0
+        self.content_types = Counter()
+        self.files = 0
+
+    def _add_code(self, role, language, code):
+        self.languages[normalize_language(language)] += 1
+        lines = count_lines(code)
+        if role == "user":
+            self.lines_requested += lines
+        elif role == "assistant":
+            self.lines_received += lines
+
+    def scan(self, role, msg, text):
+        """
+        Record everything in one message and return the text to use for word
+        counts: the text itself, or with its code blocks removed if
+        exclude_code is set.
+        """
+        content = msg.get("content") or {}
+
+        # Code interpreter calls keep their code in content["text"]
+        if content.get("content_type") == "code":
+            self._add_code(role, content.get("language") or "", content.get("text") or "")
+
+        for part in content.get("parts") or ():
+            if isinstance(part, dict):
+                self.content_types[part.get("content_type", "unknown")] += 1
+        self.files += len((msg.get("metadata") or {}).get("attachments") or ())
+
+        # Most messages have no code at all, so skip the regex for them
+        if "```" not in text:
+            return text
+
+        for match in FENCE.finditer(text):
+            self._add_code(role, match.group(1), match.group(2))
+        if self.exclude_code:
+            return FENCE.sub(" ", text)
+        return text
+
+    def merge(self, other):
+        """Fold in the counts from another shard."""
+        self.languages.update(other.languages)
+        self.lines_requested += other.lines_requested
+        self.lines_received += other.lines_received
+        self.content_types.update(other.content_types)
+        self.files += other.files
+        return self
+
+    def media_counts(self):
+        """Images, files, audio and video you shared."""
+        counts = {"images": 0, "files": self.files, "audio": 0, "video": 0}
+        for content_type, count in self.content_types.items():
+            kind = MEDIA_KINDS.get(content_type)
+            if kind:
+                counts[kind] += count
+        return counts
+
+    def results(self):
+        """Code and content-type stats for the extracted data."""
+        return {
+            "code_blocks": sum(self.languages.values()),
+            "code_languages": self.languages.most_common(8),
+            "code_lines_requested": self.lines_requested,
+            "code_lines_received": self.lines_received,
+            "content_types": dict(self.content_types),
+            "media_counts": self.media_counts(),
+        }
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Conversation Table
+
+A compact per-conversation metrics table. Instead of holding on to whole
+conversation dicts, extraction records one row of numbers per conversation
+in parallel columns, so pages can ask for "longest by words" or "longest by
+duration" without another pass over the export.
+
+Columns are appended to as `array` objects while extracting and turned into
+NumPy arrays by finalize(). Models are interned to small integer ids.
+"""
+from array import array
+import numpy as np
+
+# Column name -> array typecode
+COLUMNS = {
+    "create_time": "d",
+    "messages": "l",
+    "user_messages": "l",
+    "assistant_messages": "l",
+    "user_words": "l",
+    "assistant_words": "l",
+    "duration": "d",       # seconds between first and last message
+    "branches": "l",       # 1 for a linear chat, +1 for every edit/regenerate
+    "model": "l",          # dominant model id, -1 if unknown
+}
+
+
+class ConversationTable:
+    """Parallel columns of per-conversation metrics with top-N queries."""
+
+    __slots__ = ("ids", "titles", "model_names", "_model_ids", "columns")
+
+    def __init__(self):
+        self.ids = []
+        self.titles = []
+        self.model_names = []
+        self._model_ids = {}
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def intern_model(self, model):
+        """Return the integer id for a model slug, assigning one if new."""
+        if not model:
+            return -1
+        model_id = self._model_ids.get(model)
+        if model_id is None:
+            model_id = len(self.model_names)
+            self._model_ids[model] = model_id
+            self.model_names.append(model)
+        return model_id
+
+    def add(self, conversation_id, title, **metrics):
+        """Append one conversation. Missing metrics are recorded as 0."""
+        self.ids.append(conversation_id)
+        self.titles.append(title or "Untitled")
+        metrics["model"] = self.intern_model(metrics.get("model"))
+        for name, column in self.columns.items():
+            column.append(metrics.get(name) or 0)
+
+    def finalize(self):
+        """Convert the columns to NumPy arrays once all rows are added."""
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                self.columns[name] = np.array(column, dtype=column.typecode)
+        return self
+
+    def top(self, column, n=10):
+        """
+        Return the row indices of the n largest values in a column, largest
+        first. Ties are broken by conversation order.
+        """
+        values = np.asarray(self.columns[column])
+        if len(values) == 0 or n <= 0:
+            return []
+        if n == 1:
+            return [int(np.argmax(values))]
+        if n < len(values):
+            # Every row tied with the n-th largest value is a candidate, so
+            # the earliest of them win rather than whichever partition picks
+            kth = np.partition(values, len(values) - n)[len(values) - n]
+            candidates = np.flatnonzero(values >= kth)
+        else:
+            candidates = np.arange(len(values))
+        order = np.lexsort((candidates, -values[candidates]))
+        return [int(i) for i in candidates[order][:n]]
+
+    def row(self, i):
+        """Return a dict of all metrics for one conversation."""
+        row = {name: np.asarray(column)[i].item() for name, column in self.columns.items()}
+        row["id"] = self.ids[i]
+        row["title"] = self.titles[i]
+        row["model"] = self.model_names[row["model"]] if row["model"] >= 0 else None
+        return row
+
+    def top_titles(self, column, n=10):
+        """Return [(title, value)] for the top n conversations by a column."""
+        values = np.asarray(self.columns[column])
+        return [(self.titles[i], values[i].item()) for i in self.top(column, n)]
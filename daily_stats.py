@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Daily Stats
+
+Per-day totals (conversations, messages, words and per-model replies) for
+your whole export, with prefix sums so the totals for any date range - a
+quarter, a summer, 2024 vs 2025 - come out in constant time without
+re-reading conversations.json.
+
+Everything is attributed to the day the conversation was started, the same
+rule the wrap uses to decide which conversations fall in its period.
+
+Usage:
+    python3 daily_stats.py --range 2025-01-01 2025-04-01
+    python3 daily_stats.py --compare 2024 2025
+"""
+import argparse
+import pickle
+from array import array
+from collections import Counter
+from datetime import date, datetime, timedelta
+import numpy as np
+
+from timezones import bucket_times
+
+DATA_FILE = "extracted_data.pkl"
+
+METRICS = ("conversations", "user_messages", "gpt_messages", "user_words", "gpt_words")
+
+LABELS = {
+    "conversations": "Conversations",
+    "user_messages": "Messages sent",
+    "gpt_messages": "Messages received",
+    "user_words": "Words you sent",
+    "gpt_words": "Words GPT sent",
+}
+
+
+def parse_date(value):
+    """Parse YYYY-MM-DD (or YYYY for Jan 1st) into a datetime, or None if empty."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    value = value.strip()
+    if len(value) == 4 and value.isdigit():
+        return datetime(int(value), 1, 1)
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def year_range(year):
+    """Return the (start, end) datetimes covering a calendar year."""
+    return datetime(int(year), 1, 1), datetime(int(year) + 1, 1, 1)
+
+
+def period_label(start, end):
+    """A short human label for a period, e.g. '2025' or 'Jan 01, 2025 - Mar 31, 2025'."""
+    if start and start.month == 1 and start.day == 1 and start.hour == 0:
+        if end is None or end == datetime(start.year + 1, 1, 1):
+            return str(start.year)
+    first = start.strftime("%b %d, %Y") if start else "Start"
+    last = (end - timedelta(days=1)).strftime("%b %d, %Y") if end else "Today"
+    return f"{first} - {last}"
+
+
+class DailyStats:
+    """Per-day metric columns with prefix sums for O(1) range totals."""
+
+    def __init__(self, tz=None):
+        # Days are counted in this timezone (None: this machine's)
+        self.tz = tz
+
+        # One entry per conversation while building
+        self._times = array("d")
+        self._values = {name: array("q") for name in METRICS}
+        self._model_rows = array("l")
+        self._model_ids = array("l")
+        self._model_counts = array("q")
+        self.model_names = []
+        self._model_lookup = {}
+
+        # Filled in by finalize()
+        self.first_day = None
+        self.num_days = 0
+        self.prefix = {}
+        self.model_prefix = None
+
+    def add_conversation(self, create_time, models=None, **metrics):
+        """Record one conversation on the day it was started."""
+        row = len(self._times)
+        self._times.append(create_time)
+        metrics.setdefault("conversations", 1)
+        for name in METRICS:
+            self._values[name].append(metrics.get(name, 0))
+
+        for model, count in (models or {}).items():
+            model_id = self._model_lookup.get(model)
+            if model_id is None:
+                model_id = len(self.model_names)
+                self._model_lookup[model] = model_id
+                self.model_names.append(model)
+            self._model_rows.append(row)
+            self._model_ids.append(model_id)
+            self._model_counts.append(count)
+
+    def finalize(self):
+        """Bucket the recorded conversations by day and build prefix sums."""
+        days = bucket_times(self._times, self.tz)["day"]
+        if len(days) == 0:
+            self.first_day = date.today().toordinal()
+            self.num_days = 0
+        else:
+            self.first_day = int(days.min())
+            self.num_days = int(days.max()) - self.first_day + 1
+        offsets = days - self.first_day
+
+        # Prefix sums have a leading zero so that total = prefix[end] - prefix[start]
+        for name in METRICS:
+            per_day = np.bincount(offsets, weights=np.array(self._values[name], dtype=np.float64),
+                                  minlength=self.num_days).astype(np.int64)
+            self.prefix[name] = np.concatenate(([0], np.cumsum(per_day)))
+
+        num_models = len(self.model_names)
+        model_days = days[np.array(self._model_rows, dtype=np.int64)] - self.first_day
+        flat = model_days * num_models + np.array(self._model_ids, dtype=np.int64)
+        per_day_models = np.bincount(flat, weights=np.array(self._model_counts, dtype=np.float64),
+                                     minlength=self.num_days * num_models)
+        per_day_models = per_day_models.astype(np.int64).reshape(self.num_days, num_models)
+        self.model_prefix = np.vstack((np.zeros((1, num_models), dtype=np.int64),
+                                       np.cumsum(per_day_models, axis=0)))
+
+        # Drop the build buffers
+        self._times = self._values = None
+        self._model_rows = self._model_ids = self._model_counts = None
+        self._model_lookup = None
+        return self
+
+    def day_index(self, when):
+        """Clamp a date/datetime (or None) to a position in the prefix arrays."""
+        if when is None:
+            return None
+        if isinstance(when, datetime):
+            when = when.date()
+        return min(max(when.toordinal() - self.first_day, 0), self.num_days)
+
+    def _bounds(self, start, end):
+        lo = self.day_index(start)
+        hi = self.day_index(end)
+        lo = 0 if lo is None else lo
+        hi = self.num_days if hi is None else hi
+        return lo, max(lo, hi)
+
+    def total(self, metric, start=None, end=None):
+        """Total of a metric for days in [start, end)."""
+        lo, hi = self._bounds(start, end)
+        prefix = self.prefix[metric]
+        return int(prefix[hi] - prefix[lo])
+
+    def per_day(self, metric, start=None, end=None):
+        """Per-day values of a metric for days in [start, end)."""
+        lo, hi = self._bounds(start, end)
+        return np.diff(self.prefix[metric][lo:hi + 1])
+
+    def model_usage(self, start=None, end=None, limit=10):
+        """[(model, replies)] for days in [start, end), most used first."""
+        lo, hi = self._bounds(start, end)
+        totals = self.model_prefix[hi] - self.model_prefix[lo]
+        usage = Counter({name: int(count) for name, count in zip(self.model_names, totals) if count})
+        return usage.most_common(limit)
+
+    def summary(self, start=None, end=None):
+        """All range totals as a dict."""
+        summary = {name: self.total(name, start, end) for name in METRICS}
+        summary["model_usage"] = self.model_usage(start, end)
+        return summary
+
+
+def build_daily_stats(conversations, tz=None):
+    """Walk every conversation once and return finalized DailyStats (days in tz)."""
+    daily = DailyStats(tz)
+    for conversation in conversations:
+        count_conversation(daily, conversation)
+    return daily.finalize()
+
+
+def count_conversation(daily, conversation):
+    """Add one conversation from the export to a DailyStats being built."""
+    create_time = conversation.get("create_time")
+    if not create_time:
+        return
+
+    metrics = dict.fromkeys(METRICS[1:], 0)
+    models = Counter()
+    for node in conversation.get("mapping", {}).values():
+        msg = node.get("message")
+        if not msg:
+            continue
+        parts = msg.get("content", {}).get("parts", [])
+        text = " ".join(str(p) for p in parts if isinstance(p, str))
+        if not text.strip():
+            continue
+
+        role = msg.get("author", {}).get("role")
+        if role == "user":
+            metrics["user_messages"] += 1
+            metrics["user_words"] += len(text.split())
+        elif role == "assistant":
+            metrics["gpt_messages"] += 1
+            metrics["gpt_words"] += len(text.split())
+            model = msg.get("metadata", {}).get("model_slug", "unknown")
+            if model:
+                models[model] += 1
+
+    daily.add_conversation(create_time, models=models, **metrics)
+
+
+def print_summaries(columns):
+    """Print range summaries side by side. columns is [(label, summary)]."""
+    width = max(18, *(len(label) + 2 for label, _ in columns))
+    print(" " * 20 + "".join(f"{label:>{width}}" for label, _ in columns))
+    for name in METRICS:
+        print(f"{LABELS[name]:<20}" + "".join(f"{s[name]:>{width},}" for _, s in columns))
+    top = [s["model_usage"][0][0] if s["model_usage"] else "-" for _, s in columns]
+    print(f"{'Top Model':<20}" + "".join(f"{m:>{width}}" for m in top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Totals for any date range of your export")
+    parser.add_argument("--data", default=DATA_FILE, help="extracted data file")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--range", nargs=2, metavar=("START", "END"),
+                       help="dates as YYYY-MM-DD, END is exclusive")
+    group.add_argument("--compare", nargs=2, metavar=("YEAR_A", "YEAR_B"),
+                       help="compare two calendar years side by side")
+    args = parser.parse_args()
+
+    with open(args.data, "rb") as f:
+        daily = pickle.load(f)["daily_stats"]
+
+    if args.compare:
+        columns = [(year, daily.summary(*year_range(year))) for year in args.compare]
+    elif args.range:
+        start, end = parse_date(args.range[0]), parse_date(args.range[1])
+        columns = [(period_label(start, end), daily.summary(start, end))]
+    else:
+        columns = [("All time", daily.summary())]
+
+    print_summaries(columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,214 +4,212 @@ GPT Wrapped Data Extractor
 
 Parses your ChatGPT conversations.json export and extracts all the analytics
 needed for generating your personalized GPT Wrapped report.
+
+This is the command line front end: settings come from config.txt and the
+options below, and the stats are saved for the page modules. The analysis
+itself is in wrapped_stats.py.
 """
-import os
-import json
-from datetime import datetime
-from collections import Counter, defaultdict
+import argparse
 import pickle
-
-# Load data file path from config
-def load_config():
-    """Read the data file path from config.txt"""
-    config_path = os.path.join(os.path.dirname(__file__), "config.txt")
-    with open(config_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("DATA_FILE="):
-                return line.split("=", 1)[1].strip()
-    raise ValueError("DATA_FILE not found in config.txt")
+from array import array
+
+from prompt_index import PromptIndex
+from sqlite_export import SQLiteSink, SQLITE_FILE
+from daily_stats import (DailyStats, build_daily_stats, count_conversation, parse_date,
+                         period_label, year_range)
+from sessions import SESSION_GAP_MINUTES
+from near_duplicates import DEFAULT_THRESHOLD
+from topics import file_hash
+from draft_sample import reservoir_sample, scale_draft, DRAFT_SAMPLE_SIZE
+from timezones import get_timezone, period_bounds
+from checkpoint import extract_with_checkpoints, CHECKPOINT_FILE, CHECKPOINT_INTERVAL
+from json_backend import get_backend, load_json
+# Settings from config.txt
+from settings import load_config, load_settings
+# The analytics themselves (see wrapped_stats.py for using them as a library)
+from wrapped_stats import iter_conversations, in_period, extract_all_data
 
 DATA_FILE = load_config()
+SETTINGS = load_settings()
+
+# Only include conversations started in this period (END is exclusive, None
+# means up to today). Set START=/END= in config.txt or pass --start/--end.
+START = SETTINGS["START"]
+END = SETTINGS["END"]
 
-# Only include conversations from this year onwards
-CUTOFF = datetime(2025, 1, 1)
+# Timezone for hours, days and months (an IANA name like America/New_York).
+# Set TIMEZONE= in config.txt or pass --tz; unset means this machine's time.
+TIMEZONE = SETTINGS["TIMEZONE"]
 
 # Where to save the extracted data
 OUTPUT_FILE = "extracted_data.pkl"
 
-# Common words to exclude from the "top words" analysis
-STOP_WORDS = {
-    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of",
-    "is", "it", "that", "this", "with", "as", "be", "are", "was", "were", "been",
-    "being", "have", "has", "had", "do", "does", "did", "will", "would", "could",
-    "should", "may", "might", "can", "i", "you", "he", "she", "we", "they", "my",
-    "your", "his", "her", "our", "their", "what", "which", "who", "how", "when",
-    "where", "why", "if", "then", "else", "not", "no", "yes", "so", "just", "like",
-    "more", "some", "any", "all", "also", "from", "by", "about", "into", "through",
-    "during", "before", "after", "above", "below", "between", "under", "over",
-    "out", "up", "down", "off", "such", "there", "here", "than", "its", "let", "me",
-    "im", "dont", "cant", "wont", "youre", "theyre", "were", "ive", "use", "using",
-    "want", "need", "get", "make", "know", "see", "think", "one", "two", "new"
-}
-
-
-def load_conversations():
+# Most different words counted in memory before partial counts are written
+# to disk (WORD_MEMORY_LIMIT= in config.txt or --word-memory-limit). Unset
+# means no limit.
+WORD_MEMORY_LIMIT = SETTINGS["WORD_MEMORY_LIMIT"]
+
+# JSON parser for the export (JSON_BACKEND= in config.txt, e.g. json or
+# orjson). Unset means the fastest one installed (see json_backend.py).
+JSON_BACKEND = SETTINGS["JSON_BACKEND"]
+
+# Where to save the searchable index of your prompts
+INDEX_FILE = "prompt_index.pkl"
+
+
+def read_export():
+    """Load every conversation from the conversations.json file."""
+    backend, _ = get_backend(JSON_BACKEND)
+    print(f"Loading conversations (JSON backend: {backend})...")
+    return load_json(DATA_FILE, backend)
+
+
+def iter_export(path=None, chunk_size=1 << 20):
     """
-    Load the conversations.json file and filter to only include
-    conversations created after the cutoff date.
+    Yield the conversations in the export one at a time, reading the file in
+    chunks instead of parsing it all at once.
+    """
+    return iter_conversations(path or DATA_FILE, chunk_size)
+
+
+def sample_period(start=START, end=END, size=DRAFT_SAMPLE_SIZE, seed=None, tz=None, daily=None):
+    """
+    Stream the export and reservoir-sample `size` conversations from the
+    period. Returns (sample, conversations in the period, their start times).
+    If daily (a DailyStats being built) is given, every conversation in the
+    export is counted into it on the way, so a draft has exact per-day totals.
     """
-    print("Loading conversations...")
-    with open(DATA_FILE, "r") as f:
-        conversations = json.load(f)
-
-    filtered = []
-    for c in conversations:
-        if c.get("create_time"):
-            created = datetime.fromtimestamp(c["create_time"])
-            if created >= CUTOFF:
-                filtered.append(c)
-
-    print(f"Loaded {len(filtered)} conversations from 2025")
+    bounds = period_bounds(start, end, tz)
+    create_times = array("d")
+
+    def period_conversations():
+        for conversation in iter_export():
+            if daily is not None:
+                count_conversation(daily, conversation)
+            if in_period(conversation, bounds):
+                create_times.append(conversation["create_time"])
+                yield conversation
+
+    sample, population = reservoir_sample(period_conversations(), size, seed)
+    print(f"Sampled {len(sample)} of {population} conversations from {period_label(start, end)}")
+    return sample, population, create_times
+
+
+def filter_period(conversations, start=START, end=END, tz=None):
+    """Keep only conversations created in [start, end), in timezone tz."""
+    bounds = period_bounds(start, end, tz)
+    filtered = [c for c in conversations if in_period(c, bounds)]
+
+    print(f"Loaded {len(filtered)} conversations from {period_label(start, end)}")
     return filtered
 
 
-def extract_all_data(conversations):
+def load_conversations(start=START, end=END, tz=None):
     """
-    Process all conversations and extract analytics including:
-    - Word and message counts
-    - Most used words
-    - Model usage breakdown
-    - Activity patterns by hour and month
-    - Longest usage streak
-    - Longest conversation
+    Load the conversations.json file and filter to only include
+    conversations created in the wrap period.
     """
-    
-    # Counters for totals
-    user_words = 0
-    gpt_words = 0
-    user_messages = 0
-    gpt_messages = 0
-
-    # Track all words the user typed for frequency analysis
-    all_user_words = []
-
-    # Track prompts to find the longest ones
-    user_prompts = []
-
-    # Count which GPT models were used
-    model_counts = Counter()
-
-    # Activity tracking
-    hourly_activity = defaultdict(int)
-    monthly_activity = defaultdict(int)
-    active_days = set()
-
-    # Track the conversation with the most messages
-    longest_chat = None
-    max_messages = 0
-
-    for conversation in conversations:
-        # Record when this conversation happened
-        create_time = conversation.get("create_time")
-        if create_time:
-            dt = datetime.fromtimestamp(create_time)
-            active_days.add(dt.date())
-            hourly_activity[dt.hour] += 1
-            monthly_activity[dt.month] += 1
-
-        # Count messages in this conversation
-        msg_count = 0
-        
-        for node_id, node in conversation.get("mapping", {}).items():
-            msg = node.get("message")
-            if not msg:
-                continue
-
-            role = msg.get("author", {}).get("role")
-            parts = msg.get("content", {}).get("parts", [])
-            text = " ".join(str(p) for p in parts if isinstance(p, str))
-
-            if not text.strip():
-                continue
-
-            word_count = len(text.split())
-            msg_count += 1
-
-            if role == "user":
-                user_words += word_count
-                user_messages += 1
-                user_prompts.append((word_count, conversation.get("title", "Untitled")))
-
-                # Extract individual words for frequency analysis
-                words = text.lower().split()
-                for word in words:
-                    cleaned = ''.join(ch for ch in word if ch.isalnum())
-                    if cleaned and len(cleaned) > 2 and cleaned not in STOP_WORDS:
-                        all_user_words.append(cleaned)
-
-            elif role == "assistant":
-                gpt_words += word_count
-                gpt_messages += 1
-
-                # Track which model generated this response
-                model = msg.get("metadata", {}).get("model_slug", "unknown")
-                if model:
-                    model_counts[model] += 1
-
-        # Check if this is the longest conversation so far
-        if msg_count > max_messages:
-            max_messages = msg_count
-            longest_chat = conversation
-
-    # Calculate the longest consecutive day streak
-    sorted_days = sorted(active_days)
-    longest_streak = 0
-    streak_start = None
-    streak_end = None
-    current_streak = 1
-    current_start = sorted_days[0] if sorted_days else None
-
-    for i in range(1, len(sorted_days)):
-        days_between = (sorted_days[i] - sorted_days[i - 1]).days
-        if days_between == 1:
-            # Consecutive day, extend the streak
-            current_streak += 1
-        else:
-            # Gap in days, check if this was the longest streak
-            if current_streak > longest_streak:
-                longest_streak = current_streak
-                streak_start = current_start
-                streak_end = sorted_days[i - 1]
-            current_streak = 1
-            current_start = sorted_days[i]
-
-    # Don't forget to check the final streak
-    if current_streak > longest_streak:
-        longest_streak = current_streak
-        streak_start = current_start
-        streak_end = sorted_days[-1] if sorted_days else None
-
-    # Compile the final results
-    user_prompts.sort(reverse=True)
-    word_freq = Counter(all_user_words)
-
-    return {
-        "user_words": user_words,
-        "gpt_words": gpt_words,
-        "user_messages": user_messages,
-        "gpt_messages": gpt_messages,
-        "top_words": word_freq.most_common(10),
-        "top_prompts": user_prompts[:10],
-        "model_usage": model_counts.most_common(10),
-        "hourly_activity": dict(hourly_activity),
-        "monthly_activity": dict(monthly_activity),
-        "longest_streak": longest_streak,
-        "streak_start": streak_start,
-        "streak_end": streak_end,
-        "longest_chat_title": longest_chat.get("title", "Untitled") if longest_chat else "N/A",
-        "longest_chat_messages": max_messages,
-        "total_conversations": len(conversations),
-    }
-
-
-def main():
+    return filter_period(read_export(), start, end, tz)
+
+
+def main(argv=None):
     """Load conversations, extract data, and save results."""
-    conversations = load_conversations()
-    data = extract_all_data(conversations)
+    parser = argparse.ArgumentParser(description="Extract GPT Wrapped stats")
+    parser.add_argument("--sqlite", metavar="PATH", nargs="?", const=SQLITE_FILE,
+                        help=f"also export conversations and messages to SQLite (default: {SQLITE_FILE})")
+    parser.add_argument("--start", type=parse_date, default=START,
+                        help="first day of the wrap, YYYY-MM-DD")
+    parser.add_argument("--end", type=parse_date, default=END,
+                        help="day after the last day of the wrap, YYYY-MM-DD")
+    parser.add_argument("--year", type=int, help="wrap a whole calendar year")
+    parser.add_argument("--dup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"similarity (0-1) for prompts to count as repeats (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--session-gap", type=float, default=SESSION_GAP_MINUTES,
+                        help=f"idle minutes that end a session (default: {SESSION_GAP_MINUTES})")
+    parser.add_argument("--exclude-code", action="store_true",
+                        help="leave code blocks out of your top words")
+    parser.add_argument("--word-memory-limit", type=int, default=WORD_MEMORY_LIMIT, metavar="N",
+                        help="count at most N different words in memory, spilling the rest to disk")
+    parser.add_argument("--no-index", action="store_true",
+                        help=f"don't build {INDEX_FILE} (it holds every prompt's words)")
+    parser.add_argument("--sample", type=int, nargs="?", const=DRAFT_SAMPLE_SIZE, metavar="N",
+                        help=f"quick draft estimated from N random conversations (default: {DRAFT_SAMPLE_SIZE})")
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help=f"where to save the extracted data (default: {OUTPUT_FILE})")
+    parser.add_argument("--tz", default=TIMEZONE,
+                        help="your timezone, e.g. America/New_York (default: this machine's)")
+    parser.add_argument("--checkpoint", metavar="PATH", nargs="?", const=CHECKPOINT_FILE,
+                        help=f"save progress every --checkpoint-interval seconds (default: {CHECKPOINT_FILE})")
+    parser.add_argument("--checkpoint-interval", type=float, default=CHECKPOINT_INTERVAL,
+                        metavar="SECONDS", help=f"seconds between checkpoints (default: {CHECKPOINT_INTERVAL})")
+    parser.add_argument("--resume", action="store_true",
+                        help="carry on from the checkpoint left by an interrupted run")
+    args = parser.parse_args(argv)
+    if args.resume and not args.checkpoint:
+        args.checkpoint = CHECKPOINT_FILE
+    if args.checkpoint and (args.sample or args.sqlite):
+        parser.error("--checkpoint can't be combined with --sample or --sqlite")
+    if args.sample and args.sqlite:
+        parser.error("--sample can't be combined with --sqlite (a draft only reads a sample)")
+    if args.year:
+        args.start, args.end = year_range(args.year)
+    tz = get_timezone(args.tz)
+
+    index = None
+    sink = None
+    if args.sample:
+        # Quick draft: analyze a random sample and scale it up
+        print(f"Draft: {INDEX_FILE} isn't updated (run without --sample for that)")
+        daily = DailyStats(tz)
+        conversations, population, create_times = sample_period(args.start, args.end, args.sample,
+                                                                tz=tz, daily=daily)
+        data = extract_all_data(conversations, start=args.start, end=args.end,
+                                session_gap=args.session_gap, dup_threshold=args.dup_threshold,
+                                exclude_code=args.exclude_code,
+                                word_memory_limit=args.word_memory_limit, tz=tz)
+        scale_draft(data, population, create_times, args.start, args.end, tz)
+        data["daily_stats"] = daily.finalize()
+    elif args.checkpoint:
+        # Stream the export, saving progress as it goes (see checkpoint.py)
+        data, daily, index = extract_with_checkpoints(
+            DATA_FILE, args.checkpoint, resume=args.resume, interval=args.checkpoint_interval,
+            index=None if args.no_index else PromptIndex(), start=args.start, end=args.end, tz=tz,
+            topic_cache_key=f"{file_hash(DATA_FILE)}:{args.start}:{args.end}:{args.exclude_code}:{args.tz}",
+            session_gap=args.session_gap, dup_threshold=args.dup_threshold,
+            exclude_code=args.exclude_code, word_memory_limit=args.word_memory_limit)
+        data["daily_stats"] = daily
+    else:
+        all_conversations = read_export()
+        # Per-day totals cover the whole export so any other range can be
+        # answered later without extracting again (see daily_stats.py)
+        daily = build_daily_stats(all_conversations, tz)
+        conversations = filter_period(all_conversations, args.start, args.end, tz)
+        del all_conversations
+
+        index = None if args.no_index else PromptIndex()
+        sink = SQLiteSink(args.sqlite) if args.sqlite else None
+        data = extract_all_data(conversations, index=index, sink=sink,
+                                start=args.start, end=args.end, session_gap=args.session_gap,
+                                dup_threshold=args.dup_threshold,
+                                topic_cache_key=f"{file_hash(DATA_FILE)}:{args.start}:{args.end}:{args.exclude_code}:{args.tz}",
+                                exclude_code=args.exclude_code,
+                                word_memory_limit=args.word_memory_limit, tz=tz)
+        if sink is not None:
+            sink.close()
+        data["daily_stats"] = daily
+
+    data["period_label"] = period_label(args.start, args.end)
+    data["period_start"] = args.start
+    data["period_end"] = args.end
+    data["timezone"] = args.tz
 
     # Print a summary of what we found
-    print("\n=== GPT WRAPPED 2025 DATA ===")
+    print(f"\n=== GPT WRAPPED {data['period_label'].upper()} DATA ===")
+    if "draft" in data:
+        draft = data["draft"]
+        print(f"DRAFT: estimated from {draft['sample_size']:,} of {draft['population']:,} conversations")
+        low, high = draft["intervals"]["user_words"]
+        print(f"Words you sent (95% range): {low:,} - {high:,}")
     print(f"Words you sent: {data['user_words']:,}")
     print(f"Words GPT sent: {data['gpt_words']:,}")
     print(f"Messages sent: {data['user_messages']:,}")
@@ -219,14 +217,32 @@ def main():
     print(f"Longest streak: {data['longest_streak']} days")
     if data['streak_start'] and data['streak_end']:
         print(f"  From: {data['streak_start'].strftime('%b %d')} to {data['streak_end'].strftime('%b %d')}")
+    print(f"Current streak: {data['current_streak']} days")
+    print(f"Active days: {data['active_days']} ({data['active_day_pct']:.0f}%)")
+    print(f"Sessions: {data['session_count']:,} (median {data['median_session_minutes']:.0f} min)")
+    if data['response_latency']['count']:
+        print(f"Median response time: {data['response_latency']['p50']:.1f}s")
     print(f"Longest chat: {data['longest_chat_title']} ({data['longest_chat_messages']} messages)")
     print(f"Top word: {data['top_words'][0][0]} ({data['top_words'][0][1]} times)")
+    print(f"Unique words: {data['unique_words']:,} (type/token ratio {data['type_token_ratio']:.3f})")
     print(f"Top model: {data['model_usage'][0][0]}")
+    if data['code_blocks']:
+        print(f"Code blocks: {data['code_blocks']:,} (top language: {data['code_languages'][0][0]})")
+    if data['repeated_prompts']:
+        count, example = data['repeated_prompts'][0]
+        print(f"Most repeated question ({count} times): {example}")
 
     # Save the extracted data for the overlay generators to use
-    with open(OUTPUT_FILE, "wb") as f:
+    with open(args.output, "wb") as f:
         pickle.dump(data, f)
-    print(f"\nData saved to {OUTPUT_FILE}")
+    print(f"\nData saved to {args.output}")
+
+    # Save the prompt index so follow-up questions don't need a full rescan
+    if index is not None:
+        index.save(INDEX_FILE)
+        print(f"Prompt index saved to {INDEX_FILE} ({len(index):,} terms)")
+    if sink is not None:
+        print(f"SQLite export saved to {args.sqlite}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Draft Sample
+
+For a quick preview, only a random sample of conversations is analyzed and
+the results are scaled back up to the whole period:
+
+- the sample is a reservoir sample (Algorithm L), taken while streaming the
+  export, so it's uniform without knowing the number of conversations ahead
+- totals are estimated as population x sample mean, with a 95% confidence
+  interval from the sample's spread (with finite population correction)
+- other counts (top words, models, sessions, ...) are scaled by the sampling
+  ratio; percentiles and lengths are left as the sample measured them
+- anything that only needs each conversation's start time (hourly and
+  monthly activity, streaks) is computed exactly from every conversation
+"""
+import math
+import random
+import numpy as np
+
+from streaks import analyze_streaks
+from timezones import bucket_times, local_today
+
+# Conversations analyzed for a draft
+DRAFT_SAMPLE_SIZE = 300
+
+# z-score for the confidence intervals (95%)
+Z_95 = 1.96
+
+# Totals estimated with a confidence interval: stat -> conversation table column
+ESTIMATED_TOTALS = {
+    "user_words": "user_words",
+    "gpt_words": "assistant_words",
+    "user_messages": "user_messages",
+    "gpt_messages": "assistant_messages",
+}
+
+# Plain counts and [(name, count)] lists scaled by the sampling ratio
+SCALED_COUNTS = ["session_count", "code_blocks", "code_lines_requested", "code_lines_received"]
+SCALED_PAIRS = ["top_words", "model_usage"]
+
+_END = object()
+
+
+def reservoir_sample(items, size, seed=None):
+    """
+    Uniform random sample of `size` items from an iterable of unknown length.
+    Returns (sample, number of items seen).
+    """
+    rng = random.Random(seed)
+    sample = []
+    seen = 0
+    items = iter(items)
+
+    for item in items:
+        sample.append(item)
+        seen += 1
+        if seen == size:
+            break
+    if seen < size:
+        return sample, seen
+
+    # Algorithm L: jump straight to the next item that gets into the
+    # reservoir instead of drawing a random number for every item
+    w = math.exp(math.log(rng.random()) / size)
+    while True:
+        skip = int(math.log(rng.random()) / math.log(1 - w))
+        for _ in range(skip):
+            if next(items, _END) is _END:
+                return sample, seen
+            seen += 1
+        item = next(items, _END)
+        if item is _END:
+            return sample, seen
+        seen += 1
+        sample[rng.randrange(size)] = item
+        w *= math.exp(math.log(rng.random()) / size)
+
+
+def estimate_total(values, population):
+    """(estimate, low, high) for the population total of a sampled column."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return 0, 0, 0
+    estimate = population * values.mean()
+    if n < 2 or n >= population:
+        return int(round(estimate)), int(round(estimate)), int(round(estimate))
+    standard_error = population * values.std(ddof=1) / math.sqrt(n) * math.sqrt(1 - n / population)
+    low = max(estimate - Z_95 * standard_error, values.sum())
+    high = estimate + Z_95 * standard_error
+    return int(round(estimate)), int(round(low)), int(round(high))
+
+
+def scale_draft(data, population, create_times, start=None, end=None, tz=None):
+    """
+    Turn stats extracted from a sample into estimates for the whole period.
+    create_times are the start times of every conversation in the period.
+    """
+    sample_size = data["total_conversations"]
+    ratio = population / sample_size if sample_size else 0
+
+    table = data["conversation_table"]
+    intervals = {}
+    for name, column in ESTIMATED_TOTALS.items():
+        data[name], low, high = estimate_total(table.columns[column], population)
+        intervals[name] = (low, high)
+
+    for name in SCALED_COUNTS:
+        data[name] = int(round(data[name] * ratio))
+    for name in SCALED_PAIRS:
+        data[name] = [(key, int(round(count * ratio))) for key, count in data[name]]
+    data["monthly_top_words"] = {
+        month: [(word, int(round(count * ratio))) for word, count in words]
+        for month, words in data["monthly_top_words"].items()
+    }
+    data["monthly_model_counts"] = np.rint(data["monthly_model_counts"] * ratio).astype(np.int64)
+
+    # Exact, since every conversation's start time is known
+    created = bucket_times(create_times, tz)
+    data["hourly_activity"] = {hour: int(count) for hour, count
+                               in enumerate(np.bincount(created["hour"], minlength=24)) if count}
+    data["monthly_activity"] = {month: int(count) for month, count
+                                in enumerate(np.bincount(created["month"], minlength=13)) if count}
+    data.update(analyze_streaks(created["day"], start, end, today=local_today(tz)))
+    data["total_conversations"] = population
+
+    data["draft"] = {
+        "sample_size": sample_size,
+        "population": population,
+        "intervals": intervals,
+    }
+    return data
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Extra Page Styling
+
+Pages that don't exist in the template (sessions, distributions, ...) are
+drawn on blank pages. These helpers give them the same look as the template:
+a blue-to-pink gradient background, a bold yellow title and the footer mark.
+"""
+from reportlab.lib.colors import HexColor, Color
+
+PAGE_WIDTH = 810
+PAGE_HEIGHT = 1440
+
+TOP_COLOR = HexColor("#1F86B5")
+BOTTOM_COLOR = HexColor("#F47A9D")
+TITLE_COLOR = HexColor("#FFC24A")
+
+
+def draw_background(c, title):
+    """Fill the page with the template gradient and draw the page title."""
+    c.saveState()
+    c.linearGradient(0, PAGE_HEIGHT, 0, 0, (TOP_COLOR, BOTTOM_COLOR), extend=True)
+    c.restoreState()
+
+    # Title, split over two lines if it's long
+    c.setFillColor(TITLE_COLOR)
+    c.setFont("Helvetica-Bold", 60)
+    lines = title.split("\n")
+    for i, line in enumerate(lines):
+        c.drawCentredString(PAGE_WIDTH / 2, 1320 - i * 70, line)
+
+    # Footer mark, matching the template's corner branding
+    c.setFont("Helvetica-Bold", 26)
+    c.drawString(40, 40, "GPT RECAP")
+
+
+def draw_glass_card(c, x, y, width, height, radius=25):
+    """The frosted glass card used behind charts and tables."""
+    c.setFillColor(Color(0.95, 0.95, 0.92, alpha=0.75))
+    c.roundRect(x, y, width, height, radius, fill=True, stroke=False)
+    c.setStrokeColor(Color(1, 1, 1, alpha=0.5))
+    c.setLineWidth(2)
+    c.roundRect(x, y, width, height, radius, fill=False, stroke=True)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Heavy Hitters
+
+A bounded-memory "most common items" counter (Misra-Gries). It keeps at
+most a couple of times `capacity` entries, so a per-month word counter stays
+small however much was typed that month. Frequent items are never lost;
+their counts can be slightly low, by at most total / capacity.
+"""
+
+
+class HeavyHitters:
+    """Approximate top-k counter with bounded memory."""
+
+    __slots__ = ("capacity", "counts", "total")
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.total = 0
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, item, count=1):
+        self.total += count
+        self.counts[item] = self.counts.get(item, 0) + count
+        if len(self.counts) > 2 * self.capacity:
+            self._shrink()
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def _shrink(self):
+        # Subtract the capacity-th largest count from everything and drop
+        # what hits zero. Doing it in batches keeps updates amortized O(1).
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {item: count - threshold
+                       for item, count in self.counts.items() if count > threshold}
+
+    def merge(self, other):
+        """Fold in another counter (e.g. from a different shard)."""
+        for item, count in other.counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+        self.total += other.total
+        while len(self.counts) > 2 * self.capacity:
+            self._shrink()
+        return self
+
+    def most_common(self, n=10):
+        """[(item, approximate count)] with the largest counts first."""
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+HyperLogLog
+
+Counts distinct items (e.g. the different words you used) in a few KB,
+however many there are. An exact set grows with the vocabulary and can't be
+combined cheaply; a HyperLogLog keeps one small register per bucket, and two
+of them merge by taking the larger register, so per-month counters add up
+to a yearly one and several people's exports add up to an org-wide count.
+
+With the default precision (2^12 registers, 4KB) estimates are typically
+within about 2% of the true count.
+
+Merge the vocabularies of several exports:
+    python3 hyperloglog.py alice/extracted_data.pkl bob/extracted_data.pkl
+"""
+import argparse
+import pickle
+import zlib
+import numpy as np
+
+DEFAULT_PRECISION = 12
+
+# Items are hashed in batches of this many
+FLUSH_SIZE = 4096
+
+# Second crc32 seed, so two 32-bit hashes make one 64-bit hash
+SEED = 0x5BD1E995
+
+MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def hash64(items):
+    """64-bit hashes of strings, stable across runs and machines."""
+    encoded = [item.encode() for item in items]
+    low = np.fromiter((zlib.crc32(b) for b in encoded), dtype=np.uint64, count=len(encoded))
+    high = np.fromiter((zlib.crc32(b, SEED) for b in encoded), dtype=np.uint64, count=len(encoded))
+    # crc32 is linear, so mix the bits (splitmix64 finalizer)
+    h = (high << np.uint64(32)) | low
+    h ^= h >> np.uint64(30)
+    h = (h * np.uint64(0xBF58476D1CE4E5B9)) & MASK64
+    h ^= h >> np.uint64(27)
+    h = (h * np.uint64(0x94D049BB133111EB)) & MASK64
+    h ^= h >> np.uint64(31)
+    return h
+
+
+def bit_length(values):
+    """Number of bits needed for each uint64 (0 for 0), exactly."""
+    values = values.copy()
+    bits = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = values >= np.uint64(1 << shift)
+        bits[big] += shift
+        values[big] >>= np.uint64(shift)
+    return bits + (values > 0)
+
+
+class HyperLogLog:
+    """Mergeable distinct counter with fixed memory."""
+
+    __slots__ = ("precision", "registers", "_pending")
+
+    def __init__(self, precision=DEFAULT_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self._pending = []
+
+    def add(self, item):
+        self._pending.append(item)
+        if len(self._pending) >= FLUSH_SIZE:
+            self._flush()
+
+    def update(self, items):
+        self._pending.extend(items)
+        if len(self._pending) >= FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        # Hash everything added since the last flush in one go
+        if not self._pending:
+            return
+        hashes = hash64(self._pending)
+        self._pending = []
+
+        rest_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Position of the first 1 bit in what's left of the hash
+        ranks = (rest_bits + 1 - bit_length(rest)).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other):
+        """Fold in another counter with the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("can only merge HyperLogLogs with the same precision")
+        self._flush()
+        other._flush()
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self):
+        self._flush()
+        clone = HyperLogLog(self.precision)
+        clone.registers = self.registers.copy()
+        return clone
+
+    def __getstate__(self):
+        self._flush()
+        return {"precision": self.precision, "registers": self.registers}
+
+    def __setstate__(self, state):
+        self.precision = state["precision"]
+        self.registers = state["registers"]
+        self._pending = []
+
+    def count(self):
+        """Estimated number of distinct items added."""
+        self._flush()
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        # Small counts: linear counting over the empty registers is more accurate
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count unique words across several exports")
+    parser.add_argument("files", nargs="+", help="extracted_data.pkl files to combine")
+    args = parser.parse_args()
+
+    total = None
+    for path in args.files:
+        with open(path, "rb") as f:
+            sketch = pickle.load(f)["vocabulary_sketch"]
+        print(f"{path}: {sketch.count():,} unique words")
+        total = sketch.copy() if total is None else total.merge(sketch)
+    print(f"Combined: {total.count():,} unique words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Incremental PDF
+
+Writes the personalized PDF as an incremental update: an unchanged copy of
+the template followed by an appended section holding only what's new (the
+overlays, extra pages and the page dictionaries that point at them), plus
+a cross-reference section that points back at the template's. This is the
+same mechanism PDF editors use to save changes without rewriting a file.
+
+The template part is copied file-to-file (shutil.copyfile, which the OS can
+do without passing the bytes through Python), so what's written per user
+scales with the overlays, not with the template's backgrounds and images.
+"""
+import os
+import shutil
+from io import BytesIO
+from pypdf import PdfWriter
+from pypdf.generic import NameObject
+
+# The appended cross-reference section is a stream, a PDF 1.5 feature; the
+# catalog's /Version overrides an older header version (the template's is 1.4)
+UPDATE_VERSION = "/1.5"
+
+
+def open_template(path):
+    """A PdfWriter that records changes to the template as an update."""
+    writer = PdfWriter(path, incremental=True)
+    header_version = "/" + writer.pdf_header[len("%PDF-"):]
+    if str(writer.root_object.get("/Version", header_version)) < UPDATE_VERSION:
+        writer.root_object[NameObject("/Version")] = NameObject(UPDATE_VERSION)
+    return writer
+
+
+class _AppendAfter:
+    """
+    File-like wrapper for a file that already holds the first `offset`
+    bytes of what's being written: those are skipped, the rest is appended,
+    and tell() reports positions as if the whole thing had been written.
+    """
+
+    def __init__(self, f, offset):
+        self.f = f
+        self.offset = offset
+        self.position = 0
+
+    def write(self, data):
+        skip = min(max(self.offset - self.position, 0), len(data))
+        if skip < len(data):
+            self.f.write(data[skip:])
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        self.f.flush()
+
+
+def write_update(writer, template_path, output_path):
+    """Copy the template to output_path and append the writer's changes to it."""
+    shutil.copyfile(template_path, output_path)
+    with open(output_path, "ab") as f:
+        writer.write(_AppendAfter(f, f.tell()))
+    return output_path
+
+
+def update_bytes(writer, template_path):
+    """Just the section write_update() would append, as bytes."""
+    update = BytesIO()
+    writer.write(_AppendAfter(update, os.path.getsize(template_path)))
+    return update.getvalue()
+
+
+def save_update(update, template_path, output_path):
+    """Write a copy of the template followed by update_bytes() output."""
+    shutil.copyfile(template_path, output_path)
+    with open(output_path, "ab") as f:
+        f.write(update)
+    return output_path
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+JSON Backend
+
+Loads conversations.json with the fastest JSON parser that's installed.
+Parsing the export is the slowest part of extracting on a big one, and
+parsers like orjson are several times quicker than the standard library's.
+
+The file is memory-mapped rather than read into a Python string first:
+orjson parses straight out of the mapped file (no copy of the text at
+all), and the standard library decodes it into a string in one step
+instead of reading it in pieces.
+
+Backends are tried in PREFERENCE order, the first one installed winning;
+set JSON_BACKEND=json (or another name) in config.txt to pick one. Other
+parsers can be added with register_backend(name, loads), where loads
+takes a bytes-like object holding UTF-8 JSON.
+
+    python3 benchmark_json.py    # compare them on synthetic exports
+"""
+import json
+import mmap
+import os
+
+# name -> loads(buffer)
+BACKENDS = {}
+
+# Tried in this order when no backend is named
+PREFERENCE = ["orjson", "json"]
+
+
+def register_backend(name, loads):
+    BACKENDS[name] = loads
+
+
+def available_backends():
+    """Names of the installed backends, preferred first."""
+    return sorted(BACKENDS, key=lambda name: PREFERENCE.index(name) if name in PREFERENCE
+                  else len(PREFERENCE))
+
+
+def get_backend(name=None):
+    """(name, loads) for a backend, or the preferred installed one if name is empty."""
+    if not name:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} isn't available "
+                         f"(installed: {', '.join(available_backends())})")
+    return name, BACKENDS[name]
+
+
+def load_json(path, backend=None):
+    """Parse a JSON file by memory-mapping it and handing it to a backend."""
+    _, loads = get_backend(backend)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # An empty file can't be mapped (and isn't valid JSON either)
+            return loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                memoryview(mapped) as view:
+            return loads(view)
+
+
+def _stdlib_loads(buffer):
+    return json.loads(str(buffer, "utf-8"))
+
+
+register_backend("json", _stdlib_loads)
+
+try:
+    import orjson
+    register_backend("orjson", orjson.loads)
+except ImportError:
+    pass
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Length Stats
+
+Distributions of prompt length, response length (both in words) and
+conversation length (in messages), streamed into quantile sketches so only
+a few hundred values are kept however big the export is. Shards of a big
+export can be processed separately and merged.
+"""
+import math
+from quantile_sketch import KLLSketch
+
+# Histogram bucket edges
+WORD_EDGES = [1, 5, 10, 25, 50, 100, 250, 500, 1000, math.inf]
+MESSAGE_EDGES = [1, 2, 4, 8, 16, 32, 64, 128, math.inf]
+
+DISTRIBUTIONS = {
+    "prompt_length": WORD_EDGES,
+    "response_length": WORD_EDGES,
+    "conversation_length": MESSAGE_EDGES,
+}
+
+
+class LengthStats:
+    """Quantile sketches for prompt, response and conversation lengths."""
+
+    def __init__(self):
+        self.sketches = {name: KLLSketch() for name in DISTRIBUTIONS}
+
+    def add_prompt(self, words):
+        self.sketches["prompt_length"].add(words)
+
+    def add_response(self, words):
+        self.sketches["response_length"].add(words)
+
+    def add_conversation(self, messages):
+        self.sketches["conversation_length"].add(messages)
+
+    def merge(self, other):
+        """Fold in the sketches from another shard."""
+        for name, sketch in other.sketches.items():
+            self.sketches[name].merge(sketch)
+        return self
+
+    def results(self):
+        """Percentile summaries and histograms for the extracted stats."""
+        results = {"length_stats": self}
+        for name, edges in DISTRIBUTIONS.items():
+            sketch = self.sketches[name]
+            results[name] = sketch.summary()
+            results[f"{name}_histogram"] = (edges, sketch.histogram(edges))
+        return results
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Prompts
+
+Finds the questions you keep asking. Comparing every prompt with every other
+is O(n^2), so instead each prompt gets a MinHash signature and locality
+sensitive hashing (LSH) only compares prompts that share a band of their
+signature. That's roughly linear in the number of prompts.
+
+- threshold: how similar (Jaccard over 3-word shingles) two prompts must be
+- num_perm: signature length; more is more accurate but uses more memory
+  (4 bytes per prompt per permutation)
+"""
+import re
+import zlib
+from collections import defaultdict
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_NUM_PERM = 64
+
+# Shorter prompts ("thanks", "continue") aren't interesting repeats
+MIN_PROMPT_WORDS = 4
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Characters of each prompt kept to show as the cluster's example
+SNIPPET_LENGTH = 120
+
+# Mersenne prime for the universal hash family (a * x + b) mod P
+PRIME = (1 << 31) - 1
+
+# Multipliers combining a shingle's word hashes into one hash
+SHINGLE_MULTIPLIERS = (1000003, 998244353)
+
+# Words of pending prompts signed together in one NumPy pass (the work
+# array is num_perm * 8 bytes per word: 16 MB)
+SIGNATURE_BATCH_WORDS = 32768
+
+# Everything but letters, digits and whitespace (\w is isalnum() plus "_")
+NOT_ALNUM = re.compile(r"[^\w\s]|_")
+
+
+def choose_bands(threshold, num_perm):
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1 / bands) ** (1 / rows) is closest to the requested similarity.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def clean_words(text):
+    """A prompt's words, lowercased and stripped to letters and digits."""
+    return NOT_ALNUM.sub("", text.lower()).split()
+
+
+def word_hashes(text):
+    """crc32 of each of a prompt's cleaned words."""
+    return list(map(zlib.crc32, map(str.encode, clean_words(text))))
+
+
+class NearDuplicateFinder:
+    """Streams prompts into MinHash signatures and clusters them with LSH."""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, PRIME, size=num_perm, dtype=np.int64)
+
+        self.signatures = []
+        self.snippets = []
+        # Word hashes of prompts added but not yet signed
+        self._pending = []
+        self._pending_words = 0
+        # (band number, band values) -> prompt ids
+        self.buckets = defaultdict(list)
+
+    def __len__(self):
+        return len(self.snippets)
+
+    def minhash(self, prompts):
+        """
+        MinHash signatures, one row per prompt, for lists of word hashes.
+        The prompts are hashed together: each shingle's hash combines three
+        consecutive word hashes, every permutation is applied to all the
+        shingles at once and np.minimum.reduceat takes each prompt's
+        minimum, so there's no per-prompt NumPy work.
+        """
+        words = []
+        windows = []
+        for hashes in prompts:
+            # A prompt shorter than a shingle is a single shingle of all its words
+            padded = len(hashes) + max(SHINGLE_SIZE - len(hashes), 0)
+            windows.append(padded - SHINGLE_SIZE + 1)
+            words.extend(hashes)
+            words.extend([0] * (padded - len(hashes)))
+        words = np.array(words, dtype=np.int64) % PRIME
+        windows = np.array(windows)
+
+        # Shingle hashes at every position, then the ones inside a prompt
+        combined = words[:1 - SHINGLE_SIZE]
+        for column, multiplier in enumerate(SHINGLE_MULTIPLIERS, start=1):
+            combined = (combined * multiplier + words[column:len(words) - SHINGLE_SIZE + 1 + column]) % PRIME
+        # Skip the SHINGLE_SIZE - 1 positions straddling each pair of prompts
+        gaps = np.arange(len(windows)) * (SHINGLE_SIZE - 1)
+        shingles = combined[np.arange(windows.sum()) + np.repeat(gaps, windows)]
+        offsets = np.cumsum(windows) - windows
+
+        permuted = (np.multiply.outer(self._a, shingles) + self._b[:, None]) % PRIME
+        return np.ascontiguousarray(np.minimum.reduceat(permuted, offsets, axis=1).T, dtype=np.uint32)
+
+    def signature(self, text):
+        """MinHash signature of a prompt, or None if it's too short."""
+        if len(text.split()) < MIN_PROMPT_WORDS:
+            return None
+        hashes = word_hashes(text)
+        if not hashes:
+            return None
+        return self.minhash([hashes])[0]
+
+    def add(self, text):
+        """Add one prompt (signed later, in a batch with others)."""
+        words = text.split()
+        if len(words) < MIN_PROMPT_WORDS:
+            return
+        hashes = word_hashes(text)
+        if not hashes:
+            return
+        self.snippets.append(" ".join(words)[:SNIPPET_LENGTH])
+        self._pending.append(hashes)
+        self._pending_words += len(hashes)
+        if self._pending_words >= SIGNATURE_BATCH_WORDS:
+            self.flush()
+
+    def flush(self):
+        """Sign the pending prompts and put them in their buckets."""
+        if not self._pending:
+            return
+        signatures = self.minhash(self._pending)
+        self._pending = []
+        self._pending_words = 0
+        # Each band's values as one bytes object
+        band_keys = signatures.view(np.dtype((np.void, self.rows * 4))).tolist()
+        for signature, keys in zip(signatures, band_keys):
+            prompt_id = len(self.signatures)
+            self.signatures.append(signature)
+            for band, key in enumerate(keys):
+                self.buckets[(band, key)].append(prompt_id)
+
+    def similarity(self, i, j):
+        """Estimated Jaccard similarity of two prompts."""
+        self.flush()
+        return float(np.mean(self.signatures[i] == self.signatures[j]))
+
+    def clusters(self, top=5):
+        """
+        Group near-duplicate prompts and return the biggest clusters as
+        [(count, example prompt)].
+        """
+        self.flush()
+        parent = list(range(len(self.snippets)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Only prompts sharing a bucket are compared, each against the
+        # bucket's first prompt, so the work stays linear
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            first = members[0]
+            for other in members[1:]:
+                root_a, root_b = find(first), find(other)
+                if root_a != root_b and self.similarity(first, other) >= self.threshold:
+                    parent[root_b] = root_a
+
+        groups = defaultdict(list)
+        for i in range(len(parent)):
+            groups[find(i)].append(i)
+
+        biggest = sorted((g for g in groups.values() if len(g) > 1),
+                         key=lambda g: (-len(g), g[0]))[:top]
+        return [(len(g), self.snippets[g[0]]) for g in biggest]
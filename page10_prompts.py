@@ -5,18 +5,21 @@ Page 10: Longest Prompts
 Displays the user's top 10 longest prompts by word count,
 styled consistently with the top words table on page 5.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, Color
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("top_prompts",)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_overlay():
     """Create overlay for page 10 with prompts table."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
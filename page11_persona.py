@@ -6,7 +6,6 @@ Analyzes the user's conversation patterns and top words to determine
 their "GPT personality type" - a fun way to characterize how they
 typically interact with ChatGPT.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, Color
@@ -14,6 +13,11 @@ from reportlab.lib.utils import ImageReader
 from PIL import Image
 import os
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("top_words", "top_prompts", "top_topics", "total_conversations", "period_label")
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 PERSONA_DIR = "gpt_persona"
@@ -74,6 +78,8 @@ PERSONAS = {
 def select_persona(data):
     all_text = ' '.join([word for word, _ in data['top_words']])
     all_text += ' '.join([title for _, title in data['top_prompts']])
+    # Topic words cover every conversation, not just the longest prompts
+    all_text += ' '.join([label for label, _, _ in data.get('top_topics', [])])
     all_text = all_text.lower()
     
     scores = {}
@@ -92,8 +98,7 @@ def select_persona(data):
     return best_persona
 
 def create_overlay():
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     persona_key = select_persona(data)
     persona = PERSONAS[persona_key]
@@ -155,7 +160,7 @@ def create_overlay():
     c.setFillColor(HexColor("#666666"))
     c.setFont("Helvetica-Bold", 18)
     c.drawCentredString(PAGE_WIDTH / 2, 230, 
-                        f"Based on {data['total_conversations']:,} conversations in 2025")
+                        f"Based on {data['total_conversations']:,} conversations in {data.get('period_label', '2025')}")
     
     c.save()
     packet.seek(0)
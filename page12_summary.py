@@ -6,18 +6,25 @@ A polished summary page showing all key stats at a glance.
 Designed with visual hierarchy: primary stats at top, secondary in middle,
 achievements below, and a fun "favorite word" takeaway at the bottom.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, white, Color
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = (
+    "total_conversations", "user_words", "unique_words", "type_token_ratio", "gpt_words",
+    "user_messages", "longest_streak", "current_streak", "active_day_pct", "model_usage",
+    "top_words",
+)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_overlay():
     """Create overlay for page 12 - premium year-in-review design."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
@@ -78,7 +85,13 @@ def create_overlay():
     c.setFillColor(dark_text)
     c.setFont("Helvetica-Bold", 48)
     c.drawCentredString(right_col, top_y - 63, f"{data['user_words']:,}")
-    
+
+    if 'unique_words' in data:
+        c.setFillColor(light_muted)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawCentredString(right_col, top_y - 105,
+                            f"{data['unique_words']:,} UNIQUE  \u2022  {data['type_token_ratio']:.3f} TYPE/TOKEN")
+
     # ========================================
     # MIDDLE SECTION - Secondary Stats
     # Words Received + Messages Sent
@@ -128,6 +141,12 @@ def create_overlay():
     c.setFillColor(secondary_text)
     c.setFont("Helvetica-Bold", 22)
     c.drawCentredString(left_col, achievement_y - 40, "DAYS")
+
+    if 'current_streak' in data:
+        c.setFillColor(light_muted)
+        c.setFont("Helvetica-Bold", 14)
+        c.drawCentredString(left_col, achievement_y - 70,
+                            f"CURRENT {data['current_streak']}  \u2022  {data['active_day_pct']:.0f}% DAYS ACTIVE")
     
     # TOP MODEL - right (achievement style)
     c.setFillColor(muted_label)
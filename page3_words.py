@@ -5,19 +5,22 @@ Page 3: Word Counts
 Displays the total words sent and received in the two yellow highlight boxes.
 The top box shows words the user typed, the bottom shows GPT's responses.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("user_words", "gpt_words")
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 
 def create_overlay():
     """Generate the word count overlay for page 3."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
 
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
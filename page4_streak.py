@@ -3,21 +3,27 @@
 Page 4: Longest Streak
 
 Shows the user's longest consecutive day streak of ChatGPT usage,
-along with the start and end dates of that streak.
+along with the start and end dates of that streak, their current streak
+and how many days of the period they were active.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, white
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = (
+    "longest_streak", "streak_start", "streak_end", "current_streak", "active_day_pct",
+)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 
 def create_overlay():
     """Generate the streak information overlay for page 4."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
 
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
@@ -32,7 +38,7 @@ def create_overlay():
 
     # "DAYS" label below the number
     c.setFont("Helvetica-Bold", 60)
-    c.drawCentredString(PAGE_WIDTH / 2, 975, "DAYS")
+    c.drawCentredString(PAGE_WIDTH / 2, 975, "DAY" if data['longest_streak'] == 1 else "DAYS")
 
     # Start date (positioned above the arrow graphic)
     if data['streak_start']:
@@ -48,6 +54,15 @@ def create_overlay():
         c.setFont("Helvetica-Bold", 50)
         c.drawCentredString(PAGE_WIDTH / 2, 650, end_str)
 
+    # Current streak and active days, tucked above "YOUR GPT STREAK"
+    if 'current_streak' in data:
+        c.setFillColor(white)
+        c.setFont("Helvetica-Bold", 24)
+        current = data['current_streak']
+        c.drawCentredString(PAGE_WIDTH / 2, 585,
+                            f"CURRENT STREAK: {current} {'DAY' if current == 1 else 'DAYS'}  \u2022  "
+                            f"{data['active_day_pct']:.0f}% OF DAYS ACTIVE")
+
     c.save()
     packet.seek(0)
     return packet
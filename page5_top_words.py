@@ -5,19 +5,22 @@ Page 5: Top 10 Words
 Displays a ranked list of the user's most frequently used words,
 styled as a colorful table with a frosted glass background.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, Color
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("top_words",)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 
 def create_overlay():
     """Generate the top words table overlay for page 5."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
 
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
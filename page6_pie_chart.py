@@ -5,7 +5,6 @@ Page 6: Model Usage Pie Chart
 Visualizes which GPT models the user interacted with most frequently,
 displayed as a colorful pie chart with a legend.
 """
-import pickle
 from io import BytesIO
 import matplotlib
 matplotlib.use('Agg')
@@ -15,13 +14,17 @@ from reportlab.lib.colors import HexColor, Color
 from reportlab.lib.utils import ImageReader
 from PIL import Image
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("model_usage",)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_pie_chart():
     """Create pie chart with vibrant colors."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     models = []
     counts = []
@@ -5,18 +5,21 @@ Page 7: Longest Conversation
 Displays information about the user's longest conversation,
 including the topic title and total message count.
 """
-import pickle
 from io import BytesIO
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor, white
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("longest_chat_title", "longest_chat_messages")
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_overlay():
     """Create overlay for page 7 with longest chat info."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
@@ -5,7 +5,6 @@ Page 8: Monthly Activity Chart
 Shows a horizontal bar chart of conversations per month,
 helping visualize usage patterns throughout the year.
 """
-import pickle
 from io import BytesIO
 import matplotlib
 matplotlib.use('Agg')
@@ -16,13 +15,17 @@ from reportlab.lib.colors import HexColor, Color
 from reportlab.lib.utils import ImageReader
 from PIL import Image
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("monthly_activity",)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_bar_chart():
     """Create horizontal bar chart with transparent background."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 
               'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
@@ -83,11 +86,13 @@ def create_bar_chart():
 
 def create_overlay():
     """Create overlay for page 8 with bar chart."""
+    return chart_overlay(create_bar_chart())
+
+def chart_overlay(chart_buf):
+    """Draw a monthly chart image on the page 8 glass card."""
     packet = BytesIO()
     c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
     
-    # Create bar chart
-    chart_buf = create_bar_chart()
     img = Image.open(chart_buf)
     
     # Chart dimensions - taller chart, bottom aligned with "NUMBER OF CONVERSATIONS"
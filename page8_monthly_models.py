@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Page 8 (variant): Monthly Model Mix
+
+A stacked version of the monthly activity chart: each month's bar shows
+how many replies each model gave, so it's easy to spot when you switched
+models.
+Use it in place of the plain chart with: python3 compile_pdf.py --with monthly-models
+"""
+from io import BytesIO
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from page8_monthly_chart import chart_overlay
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("monthly_model_counts", "monthly_model_names")
+
+# Models beyond this many are grouped into "OTHER"
+MAX_MODELS = 5
+
+# Same palette as the model pie chart on page 6
+COLORS = ["#E74C3C", "#F39C12", "#27AE60", "#3498DB", "#9B59B6", "#95A5A6"]
+
+def create_stacked_chart():
+    """Create horizontal stacked bar chart with transparent background."""
+    data = load_stats()
+    
+    months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 
+              'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+    counts = np.asarray(data['monthly_model_counts'])
+    names = [name.replace("-", " ").upper() for name in data['monthly_model_names']]
+
+    # Keep the most used models and fold the rest into "OTHER"
+    order = np.argsort(-counts.sum(axis=0), kind="stable")
+    if len(order) > MAX_MODELS:
+        top, rest = order[:MAX_MODELS], order[MAX_MODELS:]
+        counts = np.column_stack((counts[:, top], counts[:, rest].sum(axis=1)))
+        names = [names[i] for i in top] + ["OTHER"]
+    else:
+        counts = counts[:, order]
+        names = [names[i] for i in order]
+
+    totals = counts.sum(axis=1)
+    max_total = totals.max() if len(totals) and totals.max() > 0 else 1
+    
+    fig, ax = plt.subplots(figsize=(10, 14), facecolor='none')
+    ax.set_facecolor('none')
+    
+    y_pos = np.arange(len(months))
+    left = np.zeros(len(months))
+    for i, name in enumerate(names):
+        ax.barh(y_pos, counts[:, i], left=left, color=COLORS[i % len(COLORS)], height=0.7,
+                edgecolor='white', linewidth=1, label=name)
+        left += counts[:, i]
+    
+    # Total replies at the end of each bar
+    for y, total in zip(y_pos, totals):
+        if total > 0:
+            ax.text(total + max_total * 0.02, y, f'{int(total):,}',
+                    va='center', ha='left',
+                    color='#333333', fontsize=14, fontweight='bold')
+    
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(months, color='#333333', fontsize=16, fontweight='bold')
+    ax.invert_yaxis()
+    ax.tick_params(axis='x', colors='#333333', labelsize=12)
+    
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    
+    ax.set_xlim(0, max_total * 1.25)
+    ax.grid(axis='x', linestyle='--', alpha=0.3, color='#666666')
+    ax.legend(loc='lower right', frameon=False, fontsize=18,
+              labelcolor='#333333', prop={'weight': 'bold'})
+    
+    plt.tight_layout()
+    
+    buf = BytesIO()
+    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', 
+                facecolor='none', edgecolor='none', transparent=True)
+    plt.close()
+    buf.seek(0)
+    
+    return buf
+
+def create_overlay():
+    """Create overlay for page 8 with the stacked model chart."""
+    return chart_overlay(create_stacked_chart())
+
+if __name__ == "__main__":
+    from pypdf import PdfReader
+    overlay = create_overlay()
+    reader = PdfReader(overlay)
+    print("Page 8 (monthly models) overlay created")
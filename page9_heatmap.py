@@ -6,7 +6,6 @@ Breaks down the user's activity across 24 hours, grouped into four
 time blocks (Night, Morning, Afternoon, Evening) to show when they
 chat with GPT the most.
 """
-import pickle
 from io import BytesIO
 import matplotlib
 matplotlib.use('Agg')
@@ -17,13 +16,17 @@ from reportlab.lib.colors import Color
 from reportlab.lib.utils import ImageReader
 from PIL import Image
 
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("hourly_activity",)
+
 PAGE_WIDTH = 810
 PAGE_HEIGHT = 1440
 
 def create_heatmap():
     """Create 4-row time block visualization."""
-    with open("extracted_data.pkl", "rb") as f:
-        data = pickle.load(f)
+    data = load_stats()
     
     hourly = [data['hourly_activity'].get(i, 0) for i in range(24)]
     max_activity = max(hourly) if max(hourly) > 0 else 1
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Extra Page: Code & Media (optional)
+
+How many code blocks went back and forth, in which languages, how many lines
+of code the user pasted vs. got back, and the images, files and audio they
+shared. Add it with: python3 compile_pdf.py --with code
+"""
+from io import BytesIO
+from reportlab.pdfgen import canvas
+from reportlab.lib.colors import HexColor
+
+from extra_page import PAGE_WIDTH, PAGE_HEIGHT, draw_background, draw_glass_card
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = (
+    "code_blocks", "code_languages", "code_lines_requested", "code_lines_received",
+    "media_counts", "period_label",
+)
+
+BAR_COLORS = ["#FF4500", "#FF6B00", "#FF8C00", "#FFA500", "#FFB732", "#FFC966"]
+
+
+def create_overlay():
+    """Generate the code & media page."""
+    data = load_stats()
+
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    draw_background(c, "YOUR CODE\n& MEDIA")
+
+    dark_text = HexColor("#1a1a1a")
+    muted_label = HexColor("#888888")
+
+    # Headline number
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.setFont("Helvetica-Bold", 150)
+    c.drawCentredString(PAGE_WIDTH / 2, 1040, f"{data.get('code_blocks', 0):,}")
+    c.setFont("Helvetica-Bold", 34)
+    c.drawCentredString(PAGE_WIDTH / 2, 985, "CODE BLOCKS")
+
+    card_x = 65
+    card_width = PAGE_WIDTH - card_x * 2
+
+    # Lines of code in each direction
+    y = 760
+    draw_glass_card(c, card_x, y, card_width, 180, radius=20)
+    for col, (label, value) in enumerate([
+            ("LINES YOU SENT", data.get('code_lines_requested', 0)),
+            ("LINES GPT WROTE", data.get('code_lines_received', 0))]):
+        center_x = card_x + card_width / 4 + col * card_width / 2
+        c.setFillColor(muted_label)
+        c.setFont("Helvetica-Bold", 18)
+        c.drawCentredString(center_x, y + 130, label)
+        c.setFillColor(dark_text)
+        c.setFont("Helvetica-Bold", 50)
+        c.drawCentredString(center_x, y + 55, f"{value:,}")
+
+    # Top languages as horizontal bars
+    languages = data.get('code_languages', [])[:len(BAR_COLORS)]
+    y = 330
+    height = 400
+    draw_glass_card(c, card_x, y, card_width, height, radius=20)
+    c.setFillColor(muted_label)
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(card_x + 30, y + height - 45, "TOP LANGUAGES")
+
+    if languages:
+        most = languages[0][1]
+        bar_left = card_x + 200
+        bar_max = card_width - 200 - 110
+        for i, (language, count) in enumerate(languages):
+            row_y = y + height - 100 - i * 48
+            c.setFillColor(dark_text)
+            c.setFont("Helvetica-Bold", 22)
+            c.drawRightString(bar_left - 15, row_y, language.upper()[:12])
+            c.setFillColor(HexColor(BAR_COLORS[i]))
+            c.roundRect(bar_left, row_y - 6, max(bar_max * count / most, 8), 30, 8,
+                        fill=True, stroke=False)
+            c.setFillColor(dark_text)
+            c.setFont("Helvetica", 20)
+            c.drawString(bar_left + max(bar_max * count / most, 8) + 12, row_y, f"{count:,}")
+    else:
+        c.setFillColor(dark_text)
+        c.setFont("Helvetica", 24)
+        c.drawCentredString(PAGE_WIDTH / 2, y + height / 2, f"No code blocks in {data.get('period_label', '2025')}")
+
+    # Images, files and audio shared
+    media = data.get('media_counts', {})
+    y = 120
+    draw_glass_card(c, card_x, y, card_width, 170, radius=20)
+    for col, (label, key) in enumerate([("IMAGES", "images"), ("FILES", "files"),
+                                        ("AUDIO", "audio")]):
+        center_x = card_x + card_width / 6 + col * card_width / 3
+        c.setFillColor(dark_text)
+        c.setFont("Helvetica-Bold", 44)
+        c.drawCentredString(center_x, y + 85, f"{media.get(key, 0):,}")
+        c.setFillColor(muted_label)
+        c.setFont("Helvetica-Bold", 18)
+        c.drawCentredString(center_x, y + 45, label)
+
+    c.save()
+    packet.seek(0)
+    return packet
+
+
+if __name__ == "__main__":
+    from pypdf import PdfReader
+    overlay = create_overlay()
+    reader = PdfReader(overlay)
+    print("Code & media page created")
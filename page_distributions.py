@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Extra Page: Length Distributions (optional)
+
+Histograms of how long the user's prompts are, how long GPT's answers are
+and how many messages their conversations run to, with the median and 90th
+percentile for each. Add it with: python3 compile_pdf.py --with distributions
+"""
+from io import BytesIO
+import math
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader
+from PIL import Image
+
+from extra_page import PAGE_WIDTH, PAGE_HEIGHT, draw_background, draw_glass_card
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = (
+    "prompt_length", "prompt_length_histogram", "response_length",
+    "response_length_histogram", "conversation_length", "conversation_length_histogram",
+)
+
+PANELS = [
+    ("prompt_length", "YOUR PROMPTS", "words", "#FF7F00"),
+    ("response_length", "GPT'S ANSWERS", "words", "#3498DB"),
+    ("conversation_length", "CONVERSATIONS", "messages", "#AF7AC5"),
+]
+
+
+def bucket_labels(edges):
+    """Readable labels like '10-24' and '1000+' for histogram buckets."""
+    labels = []
+    for low, high in zip(edges[:-1], edges[1:]):
+        if math.isinf(high):
+            labels.append(f"{low:,}+")
+        elif high - low == 1:
+            labels.append(f"{low:,}")
+        else:
+            labels.append(f"{low:,}-{high - 1:,}")
+    return labels
+
+
+def create_charts():
+    """Create the three stacked histograms with a transparent background."""
+    data = load_stats()
+
+    fig, axes = plt.subplots(3, 1, figsize=(10, 14), facecolor='none')
+    fig.subplots_adjust(hspace=0.55)
+
+    for ax, (key, label, unit, color) in zip(axes, PANELS):
+        ax.set_facecolor('none')
+        edges, counts = data[f"{key}_histogram"]
+        summary = data[key]
+        x = np.arange(len(counts))
+
+        ax.bar(x, counts, color=color, edgecolor='white', linewidth=2, width=0.75)
+        ax.set_xticks(x)
+        ax.set_xticklabels(bucket_labels(edges), fontsize=12, fontweight='bold',
+                           color='#1a1a1a', rotation=30)
+        ax.tick_params(axis='y', colors='#1a1a1a', labelsize=11)
+
+        if summary['count']:
+            subtitle = f"median {summary['p50']:,} {unit}  •  90% under {summary['p90']:,}"
+        else:
+            subtitle = "no data"
+        ax.set_title(f"{label}\n{subtitle}", fontsize=16, fontweight='bold',
+                     color='#1a1a1a', loc='left')
+
+        for spine in ['top', 'right']:
+            ax.spines[spine].set_visible(False)
+        for spine in ['bottom', 'left']:
+            ax.spines[spine].set_color('#cccccc')
+        ax.grid(axis='y', linestyle='--', alpha=0.3, color='#999999')
+
+    buf = BytesIO()
+    plt.savefig(buf, format='png', dpi=90, bbox_inches='tight',
+                facecolor='none', edgecolor='none', transparent=True)
+    plt.close()
+    buf.seek(0)
+    return buf
+
+
+def create_overlay():
+    """Generate the length distributions page."""
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    draw_background(c, "HOW LONG YOU\nCHAT")
+
+    chart_width = 680
+    chart_height = 1000
+    chart_x = (PAGE_WIDTH - chart_width) / 2
+    chart_y = 130
+
+    padding = 25
+    draw_glass_card(c, chart_x - padding, chart_y - padding,
+                    chart_width + padding * 2, chart_height + padding * 2, radius=20)
+
+    img = Image.open(create_charts())
+    c.drawImage(ImageReader(img), chart_x, chart_y, width=chart_width, height=chart_height,
+                mask='auto')
+
+    c.save()
+    packet.seek(0)
+    return packet
+
+
+if __name__ == "__main__":
+    from pypdf import PdfReader
+    overlay = create_overlay()
+    reader = PdfReader(overlay)
+    print("Distributions page created")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Page Registry
+
+Every page that can go into the wrap is registered here with where it goes
+(a template page number, or an extra page before the closing page), the
+stats it reads and the function that renders its overlay.
+
+Pages are registered by module name and only imported when they're
+rendered, so a build that finds a page's cached overlay never imports it,
+and a long-running process imports each page once. The stats a page reads
+come from the FIELDS tuple in its source, read without importing it.
+
+Other packages can add pages through the "gpt_wrapped.pages" entry point
+group. The entry point names a module that registers its pages when
+imported (or a function that does, called with no arguments):
+
+    # pyproject.toml of a plugin
+    [project.entry-points."gpt_wrapped.pages"]
+    my_pages = "my_package.wrapped_pages"
+
+    # my_package/wrapped_pages.py
+    from page_registry import register_page, page_renderer
+    register_page("cover-art", "my_package.cover_art", page=1, optional=True)
+
+    @page_renderer("thank-you", optional=True)
+    def thank_you_overlay():
+        ...  # return a BytesIO holding a one-page PDF
+
+Optional pages are added with compile_pdf.py --with NAME; an optional page
+with a page number replaces that template page's usual overlay.
+"""
+import importlib
+
+from build_graph import ALL_FIELDS, declared_fields, module_path
+
+ENTRY_POINT_GROUP = "gpt_wrapped.pages"
+
+
+class PageRenderer:
+    """A registered page: where it goes, what it reads and how it's drawn."""
+
+    def __init__(self, name, module, page=None, optional=False, fields=None,
+                 function="create_overlay", render=None):
+        self.name = name
+        self.module = module
+        self.page = page
+        self.optional = optional
+        self.function = function
+        self._fields = fields
+        self._render = render
+
+    def __repr__(self):
+        return f"PageRenderer({self.name!r}, {self.module!r}, page={self.page})"
+
+    @property
+    def source_path(self):
+        return module_path(self.module)
+
+    @property
+    def fields(self):
+        """The stats this page reads (ALL_FIELDS if it doesn't say)."""
+        if self._fields is not None:
+            return tuple(self._fields)
+        path = self.source_path
+        return declared_fields(path) if path else ALL_FIELDS
+
+    def render(self):
+        """The page's overlay as a BytesIO, importing its module on first use."""
+        if self._render is not None:
+            return self._render()
+        return getattr(importlib.import_module(self.module), self.function)()
+
+
+# name -> PageRenderer, in the order pages were registered
+_pages = {}
+_plugins_loaded = False
+
+
+def register_page(name, module=None, page=None, optional=False, fields=None,
+                  function="create_overlay"):
+    """
+    Register a page by module name (default: the page's name) without
+    importing it. page is the template page it's drawn on (None for an
+    extra page), fields the stats it reads (default: its FIELDS tuple).
+    """
+    renderer = PageRenderer(name, module or name, page, optional, fields, function)
+    _pages[name] = renderer
+    return renderer
+
+
+def page_renderer(name, page=None, optional=False, fields=None):
+    """Decorator registering an already-imported render function as a page."""
+    def decorator(render):
+        _pages[name] = PageRenderer(name, render.__module__, page, optional, fields,
+                                    render.__name__, render)
+        return render
+    return decorator
+
+
+def load_plugins():
+    """Register the pages of installed packages (once per process)."""
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    from importlib.metadata import entry_points
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python 3.9
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    for entry_point in found:
+        try:
+            loaded = entry_point.load()
+        except Exception as e:
+            print(f"   Plugin {entry_point.name}: failed to load - {e}")
+            continue
+        if callable(loaded):
+            loaded()
+
+
+def get_page(name):
+    return _pages[name]
+
+
+def optional_pages():
+    """Names of the pages added with --with NAME."""
+    return [name for name, renderer in _pages.items() if renderer.optional]
+
+
+def select_pages(options=()):
+    """
+    The pages to build with the given optional page names: (template page
+    number -> renderer, extra page renderers in order).
+    """
+    unknown = set(options) - set(optional_pages())
+    if unknown:
+        raise ValueError(f"unknown optional page(s): {', '.join(sorted(unknown))}")
+    template_pages = {}
+    extra_pages = []
+    for renderer in _pages.values():
+        if renderer.optional and renderer.name not in options:
+            continue
+        if renderer.page is None:
+            extra_pages.append(renderer)
+        elif renderer.optional or renderer.page not in template_pages:
+            template_pages[renderer.page] = renderer
+    return dict(sorted(template_pages.items())), extra_pages
+
+
+# Overlays for the template's pages
+register_page("page3_words", page=3)
+register_page("page4_streak", page=4)
+register_page("page5_top_words", page=5)
+register_page("page6_pie_chart", page=6)
+register_page("page7_longest_chat", page=7)
+register_page("page8_monthly_chart", page=8)
+register_page("page9_heatmap", page=9)
+register_page("page10_prompts", page=10)
+register_page("page11_persona", page=11)
+register_page("page12_summary", page=12)
+
+# Pages that aren't in the template. Each draws its own background on a
+# blank page, and they're inserted (in order) before the closing page.
+register_page("page_topics")
+register_page("page_sessions")
+
+# Added with --with NAME
+register_page("distributions", "page_distributions", optional=True)
+register_page("code", "page_code", optional=True)
+register_page("monthly-models", "page8_monthly_models", page=8, optional=True)
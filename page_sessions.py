@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Extra Page: Sessions
+
+Shows how the user actually sits down with ChatGPT: how many sessions they
+had, how long a typical one lasts, their marathon session, the session
+where they sent the most messages and how quickly each side replies.
+"""
+from io import BytesIO
+from reportlab.pdfgen import canvas
+from reportlab.lib.colors import HexColor
+
+from extra_page import PAGE_WIDTH, PAGE_HEIGHT, draw_background, draw_glass_card
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = (
+    "session_count", "session_gap_minutes", "median_session_minutes",
+    "messages_per_session", "longest_session_minutes", "longest_session_start",
+    "busiest_session_messages", "busiest_session_start", "response_latency",
+    "think_time",
+)
+
+
+def format_minutes(minutes):
+    """Render a duration as '45 MIN' or '3H 20M'."""
+    minutes = int(round(minutes))
+    if minutes < 60:
+        return f"{minutes} MIN"
+    return f"{minutes // 60}H {minutes % 60:02d}M"
+
+
+def format_seconds(seconds):
+    """Render a short duration as '4.2 SEC' or '3 MIN'."""
+    if seconds < 60:
+        return f"{seconds:.1f} SEC"
+    return format_minutes(seconds / 60)
+
+
+def create_overlay():
+    """Generate the sessions page."""
+    data = load_stats()
+
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    draw_background(c, "YOUR SESSIONS")
+
+    orange = HexColor("#FF8C00")
+    dark_text = HexColor("#1a1a1a")
+    muted_label = HexColor("#888888")
+
+    # Headline number
+    c.setFillColor(HexColor("#FFFFFF"))
+    c.setFont("Helvetica-Bold", 170)
+    c.drawCentredString(PAGE_WIDTH / 2, 1050, f"{data['session_count']:,}")
+    c.setFont("Helvetica-Bold", 34)
+    c.drawCentredString(PAGE_WIDTH / 2, 990, "TIMES YOU SAT DOWN WITH GPT")
+    c.setFont("Helvetica", 20)
+    c.drawCentredString(PAGE_WIDTH / 2, 950,
+                        f"a new session starts after {data['session_gap_minutes']:g} quiet minutes")
+
+    # 2 x 2 grid of stat cards
+    cards = [
+        ("TYPICAL SESSION", format_minutes(data['median_session_minutes']), "median length"),
+        ("MESSAGES PER SESSION", f"{data['messages_per_session']:.1f}", "on average"),
+        ("MARATHON SESSION", format_minutes(data['longest_session_minutes']),
+         data['longest_session_start'].strftime('%b %d').upper() if data['longest_session_start'] else ""),
+        ("BUSIEST SESSION", f"{data['busiest_session_messages']:,} MSGS",
+         data['busiest_session_start'].strftime('%b %d').upper() if data['busiest_session_start'] else ""),
+    ]
+
+    card_width = 310
+    card_height = 230
+    gap = 30
+    grid_x = (PAGE_WIDTH - card_width * 2 - gap) / 2
+    grid_top = 880
+
+    for i, (label, value, note) in enumerate(cards):
+        col = i % 2
+        row = i // 2
+        x = grid_x + col * (card_width + gap)
+        y = grid_top - (row + 1) * card_height - row * gap
+        draw_glass_card(c, x, y, card_width, card_height, radius=20)
+
+        center_x = x + card_width / 2
+        c.setFillColor(muted_label)
+        c.setFont("Helvetica-Bold", 18)
+        c.drawCentredString(center_x, y + card_height - 50, label)
+
+        c.setFillColor(orange if row == 1 else dark_text)
+        c.setFont("Helvetica-Bold", 46)
+        c.drawCentredString(center_x, y + card_height / 2 - 20, value)
+
+        c.setFillColor(muted_label)
+        c.setFont("Helvetica", 18)
+        c.drawCentredString(center_x, y + 35, note)
+
+    # Turn-taking: how long GPT takes to answer vs. how long you take to reply
+    latency = data.get('response_latency', {})
+    think = data.get('think_time', {})
+    if latency.get('count'):
+        x = grid_x
+        y = 170
+        width = card_width * 2 + gap
+        draw_glass_card(c, x, y, width, 190, radius=20)
+
+        for col, (label, summary) in enumerate([("GPT REPLIES IN", latency),
+                                                ("YOU REPLY IN", think)]):
+            center_x = x + width / 4 + col * width / 2
+            c.setFillColor(muted_label)
+            c.setFont("Helvetica-Bold", 18)
+            c.drawCentredString(center_x, y + 140, label)
+            c.setFillColor(dark_text)
+            c.setFont("Helvetica-Bold", 44)
+            value = format_seconds(summary['p50']) if summary.get('count') else "-"
+            c.drawCentredString(center_x, y + 75, value)
+            c.setFillColor(muted_label)
+            c.setFont("Helvetica", 18)
+            c.drawCentredString(center_x, y + 35, "median per turn")
+
+    c.save()
+    packet.seek(0)
+    return packet
+
+
+if __name__ == "__main__":
+    from pypdf import PdfReader
+    overlay = create_overlay()
+    reader = PdfReader(overlay)
+    print("Sessions page created")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Extra Page: Top Topics
+
+Lists the user's biggest conversation topics, found by clustering their
+conversations, styled like the top words table on page 5.
+"""
+from io import BytesIO
+from reportlab.pdfgen import canvas
+from reportlab.lib.colors import HexColor
+
+from extra_page import PAGE_WIDTH, PAGE_HEIGHT, draw_background, draw_glass_card
+from shared_stats import load_stats
+
+# Stats this page reads from extracted_data.pkl (see build_graph.py)
+FIELDS = ("top_topics",)
+
+
+def create_overlay():
+    """Generate the top topics page."""
+    data = load_stats()
+
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    draw_background(c, "YOUR TOP TOPICS")
+
+    topics = data.get('top_topics', [])[:5]
+
+    # Table layout - taller rows than page 5 to fit an example title
+    table_x = 70
+    row_height = 170
+    table_width = PAGE_WIDTH - 140
+    table_total_height = max(len(topics), 1) * row_height
+    table_y_start = 700 + (table_total_height / 2)
+
+    bg_padding = 25
+    draw_glass_card(c, table_x - bg_padding, table_y_start - table_total_height - bg_padding + 12,
+                    table_width + (bg_padding * 2), table_total_height + (bg_padding * 2) - 4,
+                    radius=20)
+
+    # Same warm gradient as page 5, spread over five rows
+    row_colors = [
+        HexColor("#FF5500"),
+        HexColor("#FF7F00"),
+        HexColor("#FFA900"),
+        HexColor("#FFD300"),
+        HexColor("#D1BD00"),
+    ]
+    dark_text = HexColor("#1a1a1a")
+
+    if not topics:
+        c.setFillColor(dark_text)
+        c.setFont("Helvetica-Bold", 32)
+        c.drawCentredString(PAGE_WIDTH / 2, table_y_start - 95, "NOT ENOUGH CHATS YET")
+
+    for i, (label, count, example) in enumerate(topics):
+        y_pos = table_y_start - (i * row_height)
+
+        c.setFillColor(row_colors[i])
+        c.roundRect(table_x, y_pos - row_height + 12, table_width, row_height - 16, 10,
+                    fill=True, stroke=False)
+
+        c.setFillColor(dark_text)
+        c.setFont("Helvetica-Bold", 40)
+        c.drawString(table_x + 18, y_pos - 75, f"{i+1}.")
+
+        # Topic words, shrunk to fit if needed
+        text = label.upper()
+        font_size = 34
+        while font_size > 20 and c.stringWidth(text, "Helvetica-Bold", font_size) > table_width - 260:
+            font_size -= 2
+        c.setFont("Helvetica-Bold", font_size)
+        c.drawString(table_x + 80, y_pos - 65, text)
+
+        # Example conversation from the topic
+        c.setFont("Helvetica", 20)
+        example = example[:38] + "..." if len(example) > 38 else example
+        c.drawString(table_x + 80, y_pos - 105, f"e.g. “{example}”")
+
+        # Number of conversations on the right
+        c.setFont("Helvetica-Bold", 34)
+        c.drawRightString(table_x + table_width - 18, y_pos - 65, f"{count:,}")
+        c.setFont("Helvetica", 16)
+        c.drawRightString(table_x + table_width - 18, y_pos - 95, "CHATS")
+
+    c.save()
+    packet.seek(0)
+    return packet
+
+
+if __name__ == "__main__":
+    from pypdf import PdfReader
+    overlay = create_overlay()
+    reader = PdfReader(overlay)
+    print("Topics page created")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+PDF Overlay
+
+Puts a rendered overlay page on top of a template page.
+
+pypdf's merge_page() decodes and parses the content streams of both pages
+into operators, renames clashing resources, and writes the combined
+stream back out uncompressed - work that grows with the (big) template
+pages, not with the overlays. stamp_overlay() instead turns the overlay
+page into a Form XObject: its content stream is reused as-is (still
+compressed), its resources come along untouched, and the template page
+only gets one extra "draw this form" instruction. Neither page's content
+is ever parsed.
+
+merge_overlay() is the old merge_page() way, kept for comparison (see
+benchmark_overlays.py).
+"""
+from io import BytesIO
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, StreamObject,
+)
+
+# Names of the overlay forms in a page's /XObject resources
+FORM_PREFIX = "/Overlay"
+
+
+def overlay_page(overlay):
+    """First page of an overlay given as PDF bytes, a BytesIO or a PdfReader."""
+    if isinstance(overlay, bytes):
+        overlay = BytesIO(overlay)
+    if not isinstance(overlay, PdfReader):
+        overlay = PdfReader(overlay)
+    return overlay.pages[0] if len(overlay.pages) else None
+
+
+def overlay_form(writer, page):
+    """A page of another PDF as a Form XObject in the writer's document."""
+    contents = page.get("/Contents")
+    contents = contents.get_object() if contents is not None else None
+    if isinstance(contents, StreamObject):
+        # Copy the stream with its filters, so it's never decompressed
+        form = contents.clone(writer)
+    else:
+        form = DecodedStreamObject()
+        form.set_data(b"\n".join(stream.get_object().get_data() for stream in contents or []))
+    if form.indirect_reference is None:
+        form = writer._add_object(form).get_object()
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject(page.mediabox),
+        NameObject("/Resources"): page.get("/Resources", DictionaryObject()).clone(writer),
+    })
+    return form.indirect_reference
+
+
+def _content_stream(writer, data):
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return writer._add_object(stream)
+
+
+def stamp_overlay(writer, page, overlay):
+    """
+    Draw an overlay (PDF bytes, BytesIO, PdfReader or page) on top of a page
+    that's already in the writer. Returns False if the overlay is empty.
+    """
+    if not hasattr(overlay, "mediabox"):
+        overlay = overlay_page(overlay)
+        if overlay is None:
+            return False
+    form = overlay_form(writer, overlay)
+
+    # The page's resources may be shared with other pages, so give it its
+    # own copy before adding the form to it
+    resources = DictionaryObject(page.get("/Resources", DictionaryObject()).get_object())
+    forms = DictionaryObject(resources.get("/XObject", DictionaryObject()).get_object())
+    name = next(f"{FORM_PREFIX}{i}" for i in range(len(forms) + 1)
+                if f"{FORM_PREFIX}{i}" not in forms)
+    forms[NameObject(name)] = form
+    resources[NameObject("/XObject")] = forms
+    page[NameObject("/Resources")] = resources
+
+    # Wrap the page's own content in q/Q so whatever graphics state it leaves
+    # behind doesn't move or recolor the overlay
+    contents = page.get("/Contents")
+    streams = []
+    if contents is not None:
+        resolved = contents.get_object()
+        streams = list(resolved) if isinstance(resolved, ArrayObject) else [page.raw_get("/Contents")]
+    page[NameObject("/Contents")] = ArrayObject([
+        _content_stream(writer, b"q\n"),
+        *streams,
+        _content_stream(writer, f"\nQ\nq {name} Do Q\n".encode()),
+    ])
+    return True
+
+
+def merge_overlay(page, overlay):
+    """The merge_page() way: parse both pages and combine their operators."""
+    if not hasattr(overlay, "mediabox"):
+        overlay = overlay_page(overlay)
+        if overlay is None:
+            return False
+    page.merge_page(overlay)
+    return True
@@ -2,8 +2,6 @@
 """
 Populate the GPT Wrapped PDF with actual data from conversations.
 """
-import json
-from datetime import datetime
 from collections import Counter
 from pypdf import PdfReader, PdfWriter
 from reportlab.lib.pagesizes import letter
@@ -12,23 +10,25 @@ from reportlab.lib.colors import Color, white, HexColor
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from io import BytesIO
-import os
 
-# Load data file path from config
-def load_config():
-    """Read the data file path from config.txt"""
-    config_path = os.path.join(os.path.dirname(__file__), "config.txt")
-    with open(config_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("DATA_FILE="):
-                return line.split("=", 1)[1].strip()
-    raise ValueError("DATA_FILE not found in config.txt")
+from daily_stats import period_label
+from json_backend import load_json
+from pdf_overlay import stamp_overlay
+from settings import load_config, load_settings
+from spill_counter import SpillingCounter
+from timezones import get_timezone, period_bounds
 
 DATA_FILE = load_config()
 PDF_FILE = "GPT_WRAPPED_TEMPLATE.pdf"
 OUTPUT_FILE = "gpt_wrapped_2025_populated.pdf"
-CUTOFF = datetime(2025, 1, 1)
+SETTINGS = load_settings()
+START = SETTINGS["START"]
+END = SETTINGS["END"]
+TIMEZONE = get_timezone(SETTINGS["TIMEZONE"])
+# Most different words counted in memory before spilling to disk
+WORD_MEMORY_LIMIT = SETTINGS["WORD_MEMORY_LIMIT"]
+# JSON parser for the export (unset: the fastest one installed)
+JSON_BACKEND = SETTINGS["JSON_BACKEND"]
 
 # Page dimensions (from PDF: 810 x 1440 points)
 PAGE_WIDTH = 810
@@ -36,15 +36,13 @@ PAGE_HEIGHT = 1440
 
 def load_data():
     """Load and filter conversation data."""
-    with open(DATA_FILE, "r") as f:
-        conversations = json.load(f)
+    conversations = load_json(DATA_FILE, JSON_BACKEND)
     
+    low, high = period_bounds(START, END, TIMEZONE)
     filtered = []
     for c in conversations:
-        if c.get("create_time"):
-            ct = datetime.fromtimestamp(c["create_time"])
-            if ct >= CUTOFF:
-                filtered.append(c)
+        if c.get("create_time") and low <= c["create_time"] < high:
+            filtered.append(c)
     
     return filtered
 
@@ -68,7 +66,7 @@ def analyze_data(conversations):
     user_prompts = []
     
     # Words
-    all_words = []
+    word_freq = SpillingCounter(WORD_MEMORY_LIMIT)
     
     # Models
     model_counts = Counter()
@@ -93,7 +91,7 @@ def analyze_data(conversations):
                         for word in words:
                             cleaned = ''.join(ch for ch in word if ch.isalnum())
                             if cleaned and len(cleaned) > 2 and cleaned not in stop_words:
-                                all_words.append(cleaned)
+                                word_freq.add(cleaned)
                     
                     elif role == "assistant":
                         model = msg.get("metadata", {}).get("model_slug", "unknown")
@@ -105,13 +103,14 @@ def analyze_data(conversations):
             longest_chat = c
     
     user_prompts.sort(reverse=True)
-    word_freq = Counter(all_words)
+    top_words = word_freq.most_common(10)
+    word_freq.close()
     
     return {
         "longest_chat_title": longest_chat.get("title", "Untitled") if longest_chat else "N/A",
         "longest_chat_messages": max_messages,
         "top_prompts": user_prompts[:10],
-        "top_words": word_freq.most_common(10),
+        "top_words": top_words,
         "model_usage": model_counts.most_common(6),
         "total_conversations": len(conversations)
     }
@@ -242,7 +241,7 @@ def create_overlay(page_num, data, width, height):
 def main():
     print("Loading conversation data...")
     conversations = load_data()
-    print(f"Loaded {len(conversations)} conversations from 2025")
+    print(f"Loaded {len(conversations)} conversations from {period_label(START, END)}")
     
     print("Analyzing data...")
     data = analyze_data(conversations)
@@ -260,6 +259,7 @@ def main():
     
     for i, page in enumerate(reader.pages):
         page_num = i + 1
+        page = writer.add_page(page)
         
         if i in overlay_pages:
             print(f"  Adding overlay to page {page_num}...")
@@ -268,12 +268,9 @@ def main():
             width = float(mediabox.width)
             height = float(mediabox.height)
             
-            # Create and merge overlay
+            # Create the overlay and draw it on top as a Form XObject
             overlay = create_overlay(page_num, data, width, height)
-            if len(overlay.pages) > 0:
-                page.merge_page(overlay.pages[0])
-        
-        writer.add_page(page)
+            stamp_overlay(writer, page, overlay)
     
     print(f"Saving to {OUTPUT_FILE}...")
     with open(OUTPUT_FILE, "wb") as f:
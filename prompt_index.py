@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Prompt Index
+
+An inverted index over your prompts, built during extraction, that answers
+follow-up questions like "how often did I ask about docker?" in milliseconds
+instead of rescanning conversations.json.
+
+Each term maps to a postings list of (conversation, message position, count)
+entries, stored as compact integer arrays.
+
+Usage:
+    python3 prompt_index.py docker
+    python3 prompt_index.py docker kubernetes --titles 20
+"""
+import argparse
+import pickle
+import time
+from array import array
+from collections import Counter
+
+from wrapped_stats import tokenize
+
+INDEX_FILE = "prompt_index.pkl"
+
+
+def normalize_terms(terms):
+    """Run query terms through the same tokenizer used for top words."""
+    normalized = []
+    for term in terms:
+        normalized.extend(tokenize(term))
+    return normalized
+
+
+class PromptIndex:
+    """Maps each term to the conversations and messages it appears in."""
+
+    def __init__(self):
+        self.conversation_ids = []
+        self.titles = []
+        # term -> (conversation indices, message positions, counts)
+        self.postings = {}
+
+    def __len__(self):
+        return len(self.postings)
+
+    def add_conversation(self, conversation_id, title):
+        """Register a conversation and return its index in the table."""
+        self.conversation_ids.append(conversation_id)
+        self.titles.append(title or "Untitled")
+        return len(self.titles) - 1
+
+    def add_message(self, conv_idx, position, words):
+        """Add the tokenized words of one user message to the index."""
+        for term, count in Counter(words).items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = (array("I"), array("I"), array("I"))
+                self.postings[term] = entry
+            entry[0].append(conv_idx)
+            entry[1].append(position)
+            entry[2].append(count)
+
+    def save(self, path=INDEX_FILE):
+        with open(path, "wb") as f:
+            pickle.dump({
+                "conversation_ids": self.conversation_ids,
+                "titles": self.titles,
+                "postings": self.postings,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        index = cls()
+        index.conversation_ids = state["conversation_ids"]
+        index.titles = state["titles"]
+        index.postings = state["postings"]
+        return index
+
+    def term_frequency(self, term):
+        """
+        Return (total uses, messages, conversations) for a single term.
+        The term must already be normalized.
+        """
+        entry = self.postings.get(term)
+        if entry is None:
+            return 0, 0, 0
+        return sum(entry[2]), len(entry[2]), len(set(entry[0]))
+
+    def conversation_counts(self, term):
+        """Return a Counter of conversation index -> uses of the term."""
+        counts = Counter()
+        entry = self.postings.get(term)
+        if entry is not None:
+            for conv_idx, count in zip(entry[0], entry[2]):
+                counts[conv_idx] += count
+        return counts
+
+    def co_occurrence(self, terms):
+        """
+        Return (messages, conversations) in which every term appears.
+        Terms must already be normalized.
+        """
+        if not terms:
+            return set(), set()
+
+        message_sets = []
+        for term in terms:
+            entry = self.postings.get(term)
+            if entry is None:
+                return set(), set()
+            message_sets.append(set(zip(entry[0], entry[1])))
+
+        # Intersect from the rarest term up to keep the sets small
+        message_sets.sort(key=len)
+        messages = message_sets[0]
+        for other in message_sets[1:]:
+            messages &= other
+
+        conversations = set(self.conversation_counts(terms[0]))
+        for term in terms[1:]:
+            conversations &= set(self.conversation_counts(term))
+
+        return messages, conversations
+
+    def matching_titles(self, terms, limit=10):
+        """
+        Return [(title, uses)] for conversations containing every term,
+        ranked by how often the terms were used in them.
+        """
+        if not terms:
+            return []
+        _, conversations = self.co_occurrence(terms)
+        totals = Counter()
+        for term in terms:
+            for conv_idx, count in self.conversation_counts(term).items():
+                if conv_idx in conversations:
+                    totals[conv_idx] += count
+        return [(self.titles[i], count) for i, count in totals.most_common(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search your ChatGPT prompts")
+    parser.add_argument("terms", nargs="+", help="words to look up")
+    parser.add_argument("--index", default=INDEX_FILE, help="path to the prompt index")
+    parser.add_argument("--titles", type=int, default=10,
+                        help="how many matching conversation titles to show")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = PromptIndex.load(args.index)
+    terms = normalize_terms(args.terms)
+    if not terms:
+        print("No searchable words in query (stop words and short words are skipped)")
+        return
+
+    for term in terms:
+        uses, messages, conversations = index.term_frequency(term)
+        print(f"{term}: used {uses:,} times in {messages:,} prompts "
+              f"across {conversations:,} conversations")
+
+    if len(terms) > 1:
+        messages, conversations = index.co_occurrence(terms)
+        print(f"\nAll together: {len(messages):,} prompts "
+              f"across {len(conversations):,} conversations")
+
+    titles = index.matching_titles(terms, limit=args.titles)
+    if titles:
+        print("\nMatching conversations:")
+        for title, count in titles:
+            print(f"  {count:>5,}  {title}")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"\n({elapsed_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
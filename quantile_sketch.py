@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketch
+
+A small KLL-style streaming quantile sketch. It answers "what's the median /
+90th percentile" for a stream of numbers while keeping only a few hundred
+values, no matter how many were added, and two sketches can be merged (for
+example one per worker shard).
+
+Values live in a stack of compactors. Level h holds values that each stand
+for 2**h originals. When a level fills up it's sorted and every other value
+is promoted to the level above, which halves its size.
+"""
+import math
+from bisect import bisect_right
+
+# Accuracy/size trade-off: ~1% rank error at k=200
+DEFAULT_K = 200
+
+# How much smaller each lower level's capacity is
+LEVEL_SHRINK = 2 / 3
+
+
+class KLLSketch:
+    """Mergeable streaming quantile summary."""
+
+    __slots__ = ("k", "levels", "count", "min", "max", "_flip", "_size", "_max_size")
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        # Alternates which half of a compactor is kept, instead of a coin flip,
+        # so results are reproducible run to run
+        self._flip = 0
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def __len__(self):
+        return self.count
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * LEVEL_SHRINK ** depth)))
+
+    def add(self, value):
+        """Add one value to the sketch."""
+        self.levels[0].append(value)
+        self.count += 1
+        self._size += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, values):
+        """Add many values."""
+        for value in values:
+            self.add(value)
+
+    def _compress(self):
+        # Compact the lowest full level; repeat while the sketch is over budget
+        while self._size >= self._max_size:
+            for h, level in enumerate(self.levels):
+                if len(level) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    level.sort()
+                    # An odd leftover stays behind at this level
+                    leftover = [level.pop()] if len(level) % 2 else []
+                    promoted = level[self._flip::2]
+                    self._flip ^= 1
+                    self.levels[h + 1].extend(promoted)
+                    self.levels[h] = leftover
+                    self._size -= len(promoted)
+                    break
+            else:
+                break
+            self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, level in enumerate(other.levels):
+            self.levels[h].extend(level)
+        self.count += other.count
+        self._size += other._size
+        self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self):
+        """All kept values with their weights, sorted by value."""
+        items = [(value, 1 << h) for h, level in enumerate(self.levels) for value in level]
+        items.sort()
+        return items
+
+    def quantiles(self, qs):
+        """Approximate values at each quantile in qs (0..1)."""
+        if self.count == 0:
+            return [None for _ in qs]
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target = q * total
+            seen = 0
+            for value, weight in items:
+                seen += weight
+                if seen >= target:
+                    results.append(value)
+                    break
+            else:
+                results.append(self.max)
+        return results
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def histogram(self, edges):
+        """
+        Approximate counts for the buckets [edges[i], edges[i + 1]).
+        Values below the first edge or at/above the last are left out.
+        """
+        counts = [0] * (len(edges) - 1)
+        for h, level in enumerate(self.levels):
+            weight = 1 << h
+            for value in level:
+                bucket = bisect_right(edges, value) - 1
+                if 0 <= bucket < len(counts):
+                    counts[bucket] += weight
+        return counts
+
+    def summary(self):
+        """Compact dict of count, min, p50, p90, p99 and max."""
+        p50, p90, p99 = self.quantiles([0.5, 0.9, 0.99])
+        return {
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "p50": p50,
+            "p90": p90,
+            "p99": p99,
+            "max": self.max if self.count else None,
+        }
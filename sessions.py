@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Sessions
+
+Groups every message timestamp into sittings ("sessions"): messages are
+sorted once and a new session starts whenever the gap since the previous
+message is longer than the inactivity threshold. This shows whether someone
+fires off many short chats in one sitting or keeps one chat going all day.
+"""
+import numpy as np
+
+from timezones import local_datetime
+
+# Minutes of silence that end a session
+SESSION_GAP_MINUTES = 30
+
+
+def detect_sessions(timestamps, gap_minutes=SESSION_GAP_MINUTES, tz=None):
+    """
+    Split message timestamps (seconds since the epoch) into sessions and
+    return summary stats about them. Start times are local to tz.
+    """
+    times = np.sort(np.asarray(timestamps, dtype=np.float64))
+    stats = {
+        "session_count": 0,
+        "session_gap_minutes": gap_minutes,
+        "median_session_minutes": 0.0,
+        "longest_session_minutes": 0.0,
+        "longest_session_start": None,
+        "messages_per_session": 0.0,
+        "busiest_session_messages": 0,
+        "busiest_session_start": None,
+    }
+    if len(times) == 0:
+        return stats
+
+    # A session starts at the first message and after every long gap
+    breaks = np.flatnonzero(np.diff(times) > gap_minutes * 60) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(times)]))
+
+    messages = ends - starts
+    minutes = (times[ends - 1] - times[starts]) / 60
+
+    longest = int(np.argmax(minutes))
+    busiest = int(np.argmax(messages))
+
+    stats.update({
+        "session_count": int(len(starts)),
+        "median_session_minutes": float(np.median(minutes)),
+        "longest_session_minutes": float(minutes[longest]),
+        "longest_session_start": local_datetime(times[starts[longest]], tz),
+        "messages_per_session": float(messages.mean()),
+        "busiest_session_messages": int(messages[busiest]),
+        "busiest_session_start": local_datetime(times[starts[busiest]], tz),
+    })
+    return stats
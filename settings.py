@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Settings
+
+Reads config.txt, the KEY=value file next to the scripts. Nothing is read
+when this is imported, so scripts that only need the optional settings
+(batch_wraps.py) don't depend on a config.txt naming a DATA_FILE; they call
+load_settings() when they run.
+"""
+import os
+
+from daily_stats import parse_date
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.txt")
+
+# First day of the wrap when START= isn't set
+DEFAULT_START = "2025-01-01"
+
+
+def load_config(key="DATA_FILE", required=True, path=CONFIG_FILE):
+    """Read a setting (by default the data file path) from config.txt"""
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith(f"{key}="):
+                    return line.split("=", 1)[1].strip()
+    if required:
+        raise ValueError(f"{key} not found in config.txt")
+    return None
+
+
+def load_settings(path=CONFIG_FILE):
+    """
+    The optional settings from config.txt, parsed:
+
+    - START, END: the wrap period as datetimes (END is exclusive, None means
+      up to today)
+    - TIMEZONE: an IANA name like America/New_York, None for this machine's
+    - WORD_MEMORY_LIMIT: an int, None for no limit
+    - JSON_BACKEND: a backend name (see json_backend.py), None for the fastest
+    """
+    word_memory_limit = load_config("WORD_MEMORY_LIMIT", required=False, path=path)
+    return {
+        "START": parse_date(load_config("START", required=False, path=path) or DEFAULT_START),
+        "END": parse_date(load_config("END", required=False, path=path)),
+        "TIMEZONE": load_config("TIMEZONE", required=False, path=path),
+        "WORD_MEMORY_LIMIT": int(word_memory_limit) if word_memory_limit else None,
+        "JSON_BACKEND": load_config("JSON_BACKEND", required=False, path=path),
+    }
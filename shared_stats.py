@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shared Stats
+
+Hands the extracted stats to worker processes without every worker
+unpickling its own copy of the big arrays.
+
+The stats are pickled with protocol 5, which writes NumPy arrays' data out
+of band as raw buffers. Those buffers are copied once into a block of
+multiprocessing.shared_memory; what's left of the pickle (titles, small
+lists and dicts) is small. Workers get a descriptor - the block's name,
+the small pickle and where each buffer sits - and unpickle it with the
+buffers pointing straight into shared memory, so every array (the
+conversation table's columns, the per-day prefix sums, the month x model
+counts, ...) is a zero-copy, read-only view. Memory stays flat however
+many workers there are.
+
+    with SharedStats(data) as shared:
+        with ProcessPoolExecutor(initializer=attach_stats,
+                                 initargs=(shared.descriptor,)) as pool:
+            ...
+
+Page modules get the stats with load_stats(), which returns the shared
+stats in a worker that attached them and reads extracted_data.pkl
+otherwise. A worker rendering pages for many users (batch_wraps.py)
+attaches each user's stats just for one task:
+
+    with attached_stats(descriptor):
+        overlay = page.render()
+"""
+import pickle
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+DATA_PICKLE = "extracted_data.pkl"
+
+# Arrays smaller than this stay in the pickle (not worth their own slot)
+SHARE_MIN_BYTES = 4096
+
+# Buffers start on cache line boundaries
+ALIGNMENT = 64
+
+# Stats attached in this process by attach_stats(), and their memory block
+_attached = None
+_block = None
+
+# Blocks attached_stats() couldn't close yet because something still held
+# a view into them (closed on a later attach)
+_retired = []
+
+
+class SharedStats:
+    """Owns the shared memory block holding a stats dict's arrays."""
+
+    def __init__(self, data):
+        buffers = []
+
+        def out_of_band(buffer):
+            # Returning False keeps the buffer out of the pickle
+            if buffer.raw().nbytes < SHARE_MIN_BYTES:
+                return True
+            buffers.append(buffer)
+            return False
+
+        payload = pickle.dumps(data, protocol=5, buffer_callback=out_of_band)
+
+        layout = []
+        size = 0
+        for buffer in buffers:
+            offset = (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+            layout.append((offset, buffer.raw().nbytes))
+            size = offset + buffer.raw().nbytes
+        self.block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for buffer, (offset, length) in zip(buffers, layout):
+            self.block.buf[offset:offset + length] = buffer.raw()
+
+        # Everything a worker needs to rebuild the stats
+        self.descriptor = (self.block.name, payload, layout)
+
+    def close(self):
+        """Free the shared memory (workers must be done with it)."""
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def start_tracker():
+    """
+    Start the resource tracker that frees shared memory left behind by a
+    crash. Call it before starting workers that will attach stats shared
+    later on, so they use this process's tracker instead of starting their
+    own (which would try to free the blocks again when they exit).
+    """
+    resource_tracker.ensure_running()
+
+
+def open_stats(descriptor):
+    """
+    (stats, memory block) from a SharedStats descriptor. The arrays in the
+    stats are read-only views into the block, which must stay open while
+    they're in use.
+    """
+    name, payload, layout = descriptor
+    # Pool workers share their parent's resource tracker, so attaching
+    # doesn't get the block unlinked when a worker exits
+    block = shared_memory.SharedMemory(name)
+    view = block.buf.toreadonly()
+    buffers = [view[offset:offset + length] for offset, length in layout]
+    return pickle.loads(payload, buffers=buffers), block
+
+
+def attach_stats(descriptor):
+    """Make shared stats this process's stats (use as a pool initializer)."""
+    global _attached, _block
+    _attached, _block = open_stats(descriptor)
+
+
+@contextmanager
+def attached_stats(descriptor):
+    """Use shared stats as this process's stats inside a with block."""
+    global _attached, _block
+    previous = _attached, _block
+    _attached, _block = open_stats(descriptor)
+    _retired.append(_block)
+    try:
+        yield
+    finally:
+        _attached, _block = previous
+        for block in list(_retired):
+            try:
+                block.close()
+            except BufferError:
+                # A page kept a reference to one of the arrays (in a figure
+                # it didn't close, say); try again next time
+                continue
+            _retired.remove(block)
+
+
+def load_stats(path=DATA_PICKLE):
+    """The stats: shared ones if this process attached some, else from the pickle."""
+    if _attached is not None:
+        # A fresh dict, so a page adding keys doesn't affect the next page
+        return dict(_attached)
+    with open(path, "rb") as f:
+        return pickle.load(f)
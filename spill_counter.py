@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Spilling Counter
+
+An exact word counter with a memory cap. Counts are kept in memory until
+more than `max_entries` different words are held, then they're written out
+to a sorted "run" file on disk and memory starts again from empty. At the
+end the runs are merged (a k-way merge, like merge sort), adding up the
+counts of the same word as they meet, so the result is exact while memory
+stays at roughly max_entries words plus one line per run file.
+
+Items must be strings without tabs or newlines (the tokenized words are).
+With max_entries=None nothing is spilled and it works like a plain Counter.
+"""
+import heapq
+import os
+import tempfile
+from collections import Counter
+
+# Most run files merged at once; more are first merged into a single run
+MERGE_FAN_IN = 64
+
+
+def read_run(path):
+    """(item, count) pairs from a run file, in sorted order."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            item, count = line.rstrip("\n").split("\t")
+            yield item, int(count)
+
+
+def merge_runs(runs):
+    """Merge sorted (item, count) streams, adding up counts of equal items."""
+    current, total = None, 0
+    for item, count in heapq.merge(*runs):
+        if item == current:
+            total += count
+            continue
+        if current is not None:
+            yield current, total
+        current, total = item, count
+    if current is not None:
+        yield current, total
+
+
+class SpillingCounter:
+    """Counter that spills to sorted run files beyond max_entries words."""
+
+    def __init__(self, max_entries, spill_dir=None):
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self.counts = Counter()
+        self.runs = []
+        self._tmp = None
+        self._files_written = 0
+
+    def __len__(self):
+        """Distinct items (needs a pass over the runs once anything spilled)."""
+        if not self.runs:
+            return len(self.counts)
+        return sum(1 for _ in self.items())
+
+    def add(self, item, count=1):
+        self.counts[item] += count
+        if self.max_entries is not None and len(self.counts) > self.max_entries:
+            self._spill()
+
+    def update(self, items):
+        self.counts.update(items)
+        if self.max_entries is not None and len(self.counts) > self.max_entries:
+            self._spill()
+
+    def _write_run(self, pairs):
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="gpt_wrapped_", dir=self.spill_dir)
+        path = os.path.join(self._tmp.name, f"run{self._files_written:05d}.tsv")
+        self._files_written += 1
+        with open(path, "w", encoding="utf-8") as f:
+            for item, count in pairs:
+                f.write(f"{item}\t{count}\n")
+        return path
+
+    def _spill(self):
+        self.runs.append(self._write_run(sorted(self.counts.items())))
+        self.counts = Counter()
+
+        # Keep the number of open files bounded during the final merge
+        if len(self.runs) >= MERGE_FAN_IN:
+            merged = self._write_run(merge_runs([read_run(path) for path in self.runs]))
+            for path in self.runs:
+                os.remove(path)
+            self.runs = [merged]
+
+    def items(self):
+        """Every (item, exact count), sorted by item."""
+        return merge_runs([read_run(path) for path in self.runs]
+                          + [iter(sorted(self.counts.items()))])
+
+    def most_common(self, n):
+        """
+        The n most common (item, count) pairs, exactly. If nothing was
+        spilled this is the same as Counter.most_common; otherwise ties are
+        broken alphabetically.
+        """
+        if not self.runs:
+            return self.counts.most_common(n)
+        return heapq.nsmallest(n, self.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def __getstate__(self):
+        # The run files live in a temporary directory that's gone by the
+        # time a pickle is loaded again, so their contents go in the pickle
+        state = {key: value for key, value in vars(self).items() if key not in ("runs", "_tmp")}
+        runs = []
+        for path in self.runs:
+            with open(path, "rb") as f:
+                runs.append(f.read())
+        state["runs"] = runs
+        return state
+
+    def __setstate__(self, state):
+        runs = state.pop("runs")
+        vars(self).update(state)
+        self.runs = []
+        self._tmp = None
+        for contents in runs:
+            path = self._write_run(())
+            with open(path, "wb") as f:
+                f.write(contents)
+            self.runs.append(path)
+
+    def close(self):
+        """Delete the run files."""
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+        self.runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+SQLite Export
+
+An optional extraction sink that bulk-loads your conversations and messages
+into a local SQLite file, so you can explore your history with plain SQL:
+
+    sqlite3 conversations.db "SELECT model_slug, COUNT(*) FROM messages
+                              WHERE role = 'assistant' GROUP BY 1 ORDER BY 2 DESC"
+
+Rows are buffered and written with executemany() in batches, one transaction
+per batch. Indexes are created once at the end, which is much faster than
+maintaining them during the load.
+"""
+import os
+import sqlite3
+
+SQLITE_FILE = "conversations.db"
+
+# Number of rows buffered before they are written to the database
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE conversations (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    create_time REAL,
+    update_time REAL,
+    message_count INTEGER
+);
+CREATE TABLE messages (
+    id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL REFERENCES conversations(id),
+    position INTEGER,
+    role TEXT,
+    create_time REAL,
+    word_count INTEGER,
+    model_slug TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_conversations_create_time ON conversations(create_time);
+CREATE INDEX idx_messages_conversation ON messages(conversation_id, position);
+CREATE INDEX idx_messages_role_time ON messages(role, create_time);
+CREATE INDEX idx_messages_model ON messages(model_slug);
+"""
+
+
+class SQLiteSink:
+    """Collects conversation and message rows and writes them in batches."""
+
+    def __init__(self, path=SQLITE_FILE, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+
+        # Start from a fresh file so re-running extraction doesn't duplicate rows
+        if os.path.exists(path):
+            os.remove(path)
+
+        self.conn = sqlite3.connect(path)
+        # Bulk load settings - the file can always be regenerated from the export
+        self.conn.execute("PRAGMA journal_mode = MEMORY")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.executescript(SCHEMA)
+
+        self.conversation_rows = []
+        self.message_rows = []
+
+    def add_conversation(self, conversation_id, title, create_time, update_time, message_count):
+        self.conversation_rows.append(
+            (conversation_id, title, create_time, update_time, message_count)
+        )
+        if len(self.conversation_rows) >= self.batch_size:
+            self.flush()
+
+    def add_message(self, message_id, conversation_id, position, role,
+                    create_time, word_count, model_slug):
+        self.message_rows.append(
+            (message_id, conversation_id, position, role, create_time, word_count, model_slug)
+        )
+        if len(self.message_rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows in a single transaction."""
+        with self.conn:
+            if self.conversation_rows:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?, ?)",
+                    self.conversation_rows,
+                )
+            if self.message_rows:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self.message_rows,
+                )
+        self.conversation_rows = []
+        self.message_rows = []
+
+    def close(self):
+        """Flush remaining rows, build the indexes and close the database."""
+        self.flush()
+        with self.conn:
+            self.conn.executescript(INDEXES)
+        self.conn.execute("ANALYZE")
+        self.conn.close()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Streaks
+
+Streak and gap analytics computed from a per-day activity bitmap. Runs of
+active and inactive days are found with NumPy run-length encoding, so the
+longest streak, current streak, longest gap, top streaks, weekly streaks and
+active-day percentage all come out of one vectorized pass.
+"""
+from datetime import date, datetime
+import numpy as np
+
+
+def to_ordinal(when):
+    """Day number for a date/datetime, or None."""
+    if when is None:
+        return None
+    if isinstance(when, datetime):
+        when = when.date()
+    return when.toordinal()
+
+
+def find_runs(bitmap):
+    """
+    Run-length encode the True runs of a boolean array.
+    Returns (starts, lengths) as NumPy arrays.
+    """
+    padded = np.concatenate(([0], bitmap.astype(np.int8), [0]))
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def longest_run(starts, lengths):
+    """(length, start) of the longest run, earliest first on ties."""
+    if len(lengths) == 0:
+        return 0, None
+    i = int(np.argmax(lengths))
+    return int(lengths[i]), int(starts[i])
+
+
+def analyze_streaks(day_ordinals, start=None, end=None, today=None, top=3):
+    """
+    Compute streak stats from the day numbers (date.toordinal()) that had
+    activity. The bitmap runs from the period start (or first active day)
+    up to the last day of the period, or today if the period is still open.
+    """
+    days = np.unique(np.asarray(day_ordinals, dtype=np.int64))
+    empty = {
+        "longest_streak": 0, "streak_start": None, "streak_end": None,
+        "current_streak": 0, "top_streaks": [],
+        "longest_gap": 0, "gap_start": None, "gap_end": None,
+        "longest_weekly_streak": 0, "active_days": 0, "active_day_pct": 0.0,
+    }
+    if len(days) == 0:
+        return empty
+
+    # Span of the bitmap
+    today = to_ordinal(today or date.today())
+    first = to_ordinal(start) or int(days[0])
+    last = to_ordinal(end) - 1 if end is not None else today
+    last = max(min(last, today), int(days[-1]))
+    days = days[(days >= first) & (days <= last)]
+    if len(days) == 0:
+        return empty
+
+    bitmap = np.zeros(last - first + 1, dtype=bool)
+    bitmap[days - first] = True
+
+    def day(offset):
+        return date.fromordinal(first + int(offset))
+
+    # Streaks of active days
+    starts, lengths = find_runs(bitmap)
+    longest, longest_start = longest_run(starts, lengths)
+    order = np.lexsort((starts, -lengths))[:top]
+    top_streaks = [(int(lengths[i]), day(starts[i]), day(starts[i] + lengths[i] - 1))
+                   for i in order]
+    current = int(lengths[-1]) if starts[-1] + lengths[-1] == len(bitmap) else 0
+
+    # Gaps between active days (leading/trailing idle days don't count)
+    inner = ~bitmap[days[0] - first:days[-1] - first + 1]
+    gap_starts, gap_lengths = find_runs(inner)
+    gap, gap_start = longest_run(gap_starts, gap_lengths)
+    if gap:
+        gap_start += days[0] - first
+
+    # Weekly streaks: consecutive Monday-to-Sunday weeks with any activity
+    weeks = np.unique((days - 1) // 7)
+    week_bitmap = np.zeros(weeks[-1] - weeks[0] + 1, dtype=bool)
+    week_bitmap[weeks - weeks[0]] = True
+    weekly, _ = longest_run(*find_runs(week_bitmap))
+
+    return {
+        "longest_streak": longest,
+        "streak_start": day(longest_start),
+        "streak_end": day(longest_start + longest - 1),
+        "current_streak": current,
+        "top_streaks": top_streaks,
+        "longest_gap": gap,
+        "gap_start": day(gap_start) if gap else None,
+        "gap_end": day(gap_start + gap - 1) if gap else None,
+        "longest_weekly_streak": weekly,
+        "active_days": int(len(days)),
+        "active_day_pct": 100.0 * len(days) / len(bitmap),
+    }
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Synthetic Export
+
+Writes a made-up conversations.json with the same structure as a real
+ChatGPT export (a message tree per conversation, model slugs, timestamps,
+the odd code block and image), for trying things out and benchmarking
+without sharing your own history. The same seed gives the same file.
+
+Usage:
+    python3 synthetic_export.py 5000 synthetic.json [--seed 1]
+"""
+import argparse
+import json
+import random
+import uuid
+
+WORDS = ("docker python error fix build deploy kubernetes react model data api test "
+         "function class the a and to of learn plan idea story write email").split()
+MODELS = ["gpt-4o", "gpt-4", "gpt-4o-mini", "o1", "gpt-3.5-turbo"]
+
+# Conversations start between here (Nov 2023) and about two years later
+FIRST_TIME = 1698883200
+SPAN_SECONDS = 700 * 86400
+
+
+def synthetic_conversation(rng):
+    """One conversation: 1-12 exchanges in a single branch."""
+    created = FIRST_TIME + rng.randint(0, SPAN_SECONDS)
+    root = str(uuid.UUID(int=rng.getrandbits(128)))
+    mapping = {root: {"id": root, "message": None, "parent": None, "children": []}}
+    previous = root
+    when = created
+    for _ in range(rng.randint(1, 12)):
+        for role in ("user", "assistant"):
+            node_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            when += rng.randint(2, 600)
+            if role == "user" and rng.random() < 0.1:
+                text = ("Here is code:\n```python\ndef f(x):\n    return x\n```\nwhy "
+                        + " ".join(rng.choices(WORDS, k=5)))
+            else:
+                text = " ".join(rng.choices(WORDS, k=rng.randint(3, 80)))
+            parts = [text]
+            content_type = "text"
+            if role == "user" and rng.random() < 0.05:
+                parts = [{"content_type": "image_asset_pointer", "asset_pointer": "file-x"}, text]
+                content_type = "multimodal_text"
+            message = {
+                "id": node_id,
+                "author": {"role": role},
+                "create_time": when,
+                "content": {"content_type": content_type, "parts": parts},
+                "metadata": {"model_slug": rng.choice(MODELS)} if role == "assistant" else {},
+            }
+            mapping[node_id] = {"id": node_id, "message": message, "parent": previous, "children": []}
+            mapping[previous]["children"].append(node_id)
+            previous = node_id
+
+    conversation_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    return {
+        "title": "Chat about " + rng.choice(WORDS),
+        "create_time": created,
+        "update_time": when,
+        "mapping": mapping,
+        "current_node": previous,
+        "id": conversation_id,
+        "conversation_id": conversation_id,
+    }
+
+
+def write_export(path, conversations, seed=1):
+    """Write an export with that many conversations to path."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        # One conversation at a time, so a big export doesn't have to fit in memory
+        f.write("[")
+        for i in range(conversations):
+            if i:
+                f.write(", ")
+            json.dump(synthetic_conversation(rng), f)
+        f.write("]")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic conversations.json")
+    parser.add_argument("conversations", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    write_export(args.output, args.conversations, args.seed)
+    print(f"Wrote {args.conversations:,} conversations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
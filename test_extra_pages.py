@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Extra pages end up in the saved PDF with their overlay on them, both when
+the PDF is rewritten and when it's an incremental update to the template.
+
+    python -m pytest test_extra_pages.py
+"""
+import os
+from io import BytesIO
+
+from pypdf import PdfReader
+from reportlab.pdfgen import canvas
+
+from compile_pdf import INPUT_PDF, compose_pdf
+from incremental_pdf import write_update
+
+
+def overlay_bytes(width, height):
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(width, height))
+    pdf.drawString(72, 72, "EXTRA PAGE")
+    pdf.save()
+    return buffer.getvalue()
+
+
+def check_extra_page(path, template_pages):
+    reader = PdfReader(path)
+    assert len(reader.pages) == template_pages + 1
+    # Inserted before the closing page
+    extra = reader.pages[template_pages - 1]
+    assert extra.get("/Contents") is not None
+    assert "/XObject" in extra["/Resources"]
+    assert "EXTRA PAGE" in extra.extract_text()
+
+
+def test_extra_page_is_stamped(tmp_path):
+    template = PdfReader(INPUT_PDF)
+    closing = template.pages[-1]
+    overlay = overlay_bytes(float(closing.mediabox.width), float(closing.mediabox.height))
+
+    writer = compose_pdf({}, [("extra", overlay)], log=lambda *args: None)
+    path = os.path.join(tmp_path, "rewritten.pdf")
+    with open(path, "wb") as f:
+        writer.write(f)
+    check_extra_page(path, len(template.pages))
+
+
+def test_extra_page_is_stamped_incremental(tmp_path):
+    template = PdfReader(INPUT_PDF)
+    closing = template.pages[-1]
+    overlay = overlay_bytes(float(closing.mediabox.width), float(closing.mediabox.height))
+
+    writer = compose_pdf({}, [("extra", overlay)], incremental=True, log=lambda *args: None)
+    path = os.path.join(tmp_path, "incremental.pdf")
+    write_update(writer, INPUT_PDF, path)
+    check_extra_page(path, len(template.pages))
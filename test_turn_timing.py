@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Response latency counts the first answer to a prompt, not regenerated ones.
+
+    python -m pytest test_turn_timing.py
+"""
+from turn_timing import TurnTimer
+
+
+def node(node_id, role, create_time, parent, children):
+    message = None
+    if role is not None:
+        message = {"author": {"role": role}, "create_time": create_time}
+    return {"id": node_id, "parent": parent, "children": children, "message": message}
+
+
+def add_all(timer, mapping, order):
+    for node_id in order:
+        message = mapping[node_id]["message"]
+        if message is not None:
+            timer.add_message(mapping, mapping[node_id], message["author"]["role"],
+                              message["create_time"])
+
+
+def regenerated_mapping():
+    # Asked at 100 and answered at 105; regenerated after reading it, the
+    # second answer came at 402 (behind a tool call started at 400)
+    return {
+        "root": node("root", None, None, None, ["prompt"]),
+        "prompt": node("prompt", "user", 100, "root", ["answer", "tool"]),
+        "answer": node("answer", "assistant", 105, "prompt", []),
+        "tool": node("tool", "tool", 400, "prompt", ["regenerated"]),
+        "regenerated": node("regenerated", "assistant", 402, "tool", []),
+    }
+
+
+def test_regenerated_answer_is_not_timed():
+    mapping = regenerated_mapping()
+    for order in (["prompt", "answer", "regenerated"], ["regenerated", "answer", "prompt"]):
+        timer = TurnTimer()
+        add_all(timer, mapping, order)
+        results = timer.results()
+        assert results["turns"] == 1
+        assert results["response_latency"]["count"] == 1
+        assert results["response_latency"]["max"] == 5
+
+
+def test_single_answer_is_timed():
+    mapping = {
+        "root": node("root", None, None, None, ["prompt"]),
+        "prompt": node("prompt", "user", 100, "root", ["answer"]),
+        "answer": node("answer", "assistant", 130, "prompt", []),
+    }
+    timer = TurnTimer()
+    add_all(timer, mapping, ["prompt", "answer"])
+    assert timer.results()["response_latency"]["p50"] == 30
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Timezones
+
+Turns timestamps into local hours, days and months in the user's own
+timezone (an IANA name like "America/New_York", via zoneinfo) rather than
+whatever timezone the machine making the wrap is set to.
+
+Instead of building a datetime for every timestamp, the zone's UTC offsets
+are worked out once for the span of the data - a small table of transition
+times (daylight saving changes) and the offset from each one on - and then
+every timestamp is shifted and bucketed with NumPy in one step.
+
+TIMEZONE=Europe/Berlin in config.txt or --tz sets it; unset means the
+machine's local time, as before.
+"""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# date.toordinal() of 1970-01-01
+EPOCH_ORDINAL = 719163
+
+
+def get_timezone(name):
+    """ZoneInfo for an IANA name, or None (the machine's local time) if empty."""
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown timezone {name!r} (on Windows, pip install tzdata)") from None
+
+
+def utc_offset(timestamp, tz=None):
+    """Seconds ahead of UTC at a moment in tz (None: the machine's local time)."""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc).astimezone(tz)
+    return int(moment.utcoffset().total_seconds())
+
+
+def offset_table(tz, first, last):
+    """
+    (transition times, offsets) covering [first, last]: offsets[i] applies
+    from times[i] until times[i + 1]. The offset is checked once a day and
+    every change is narrowed down to the second.
+    """
+    first = int(first) - SECONDS_PER_DAY
+    last = int(last) + SECONDS_PER_DAY
+    times = [first]
+    offsets = [utc_offset(first, tz)]
+
+    previous = first
+    for moment in range(first + SECONDS_PER_DAY, last + SECONDS_PER_DAY, SECONDS_PER_DAY):
+        if utc_offset(moment, tz) != offsets[-1]:
+            # The change happened in (lo, hi]
+            lo, hi = previous, moment
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if utc_offset(mid, tz) == offsets[-1]:
+                    lo = mid
+                else:
+                    hi = mid
+            times.append(hi)
+            offsets.append(utc_offset(hi, tz))
+        previous = moment
+    return np.array(times, dtype=np.float64), np.array(offsets, dtype=np.int64)
+
+
+def bucket_times(timestamps, tz=None):
+    """
+    Local calendar fields for an array of timestamps (seconds since the
+    epoch, NaN for unknown): dict of int arrays "hour", "weekday" (Monday
+    is 0), "day" (date.toordinal()), "month" (1-12) and "year". Unknown
+    timestamps get -1 everywhere.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    known = ~np.isnan(timestamps)
+    fields = {name: np.full(len(timestamps), -1, dtype=np.int64)
+              for name in ("hour", "weekday", "day", "month", "year")}
+    if not known.any():
+        return fields
+
+    ts = timestamps[known]
+    times, offsets = offset_table(tz, ts.min(), ts.max())
+    local = np.floor(ts + offsets[np.searchsorted(times, ts, side="right") - 1]).astype(np.int64)
+
+    days = local // SECONDS_PER_DAY
+    months = local.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    fields["hour"][known] = local % SECONDS_PER_DAY // 3600
+    fields["weekday"][known] = (days + 3) % 7    # 1970-01-01 was a Thursday
+    fields["day"][known] = days + EPOCH_ORDINAL
+    fields["month"][known] = months % 12 + 1
+    fields["year"][known] = months // 12 + 1970
+    return fields
+
+
+def local_datetime(timestamp, tz=None):
+    """Naive local datetime for a timestamp, like datetime.fromtimestamp()."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).astimezone(tz).replace(tzinfo=None)
+
+
+def to_timestamp(when, tz=None):
+    """Timestamp of a naive local datetime in tz, or None."""
+    if when is None:
+        return None
+    if tz is None:
+        return when.timestamp()
+    return when.replace(tzinfo=tz).timestamp()
+
+
+def period_bounds(start, end, tz=None):
+    """[start, end) as timestamps; a missing end is open-ended."""
+    low = to_timestamp(start, tz)
+    high = to_timestamp(end, tz)
+    return (float("-inf") if low is None else low,
+            float("inf") if high is None else high)
+
+
+def local_today(tz=None):
+    """Today's date in tz."""
+    return datetime.now(tz).date() if tz is not None else datetime.now().date()
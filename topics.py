@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Topics
+
+Groups conversations into "your top topics" without any ML libraries:
+
+1. Each conversation (its title plus the words of its prompts) is turned into
+   a sparse TF-IDF vector with a hashing vectorizer - words are hashed into a
+   fixed number of columns, so memory doesn't grow with the vocabulary. The
+   words used to label topics come from a bounded heavy-hitters counter of
+   the most frequent terms, not a count of every word.
+2. Mini-batch k-means clusters the vectors. Only one small batch is made
+   dense at a time, so memory stays fixed however many conversations there are.
+
+The fitted model is cached per export and settings, one file per key under
+.build_cache/topics/, so re-rendering the same export skips the clustering
+and different exports don't overwrite each other's models.
+"""
+import hashlib
+import os
+import pickle
+import zlib
+from array import array
+from collections import Counter
+import numpy as np
+
+from build_graph import CACHE_DIR, digest
+from heavy_hitters import HeavyHitters
+
+TOPICS_CACHE_DIR = os.path.join(CACHE_DIR, "topics")
+
+NUM_TOPICS = 8
+NUM_FEATURES = 1 << 14     # hashed columns
+BATCH_SIZE = 256           # rows made dense at a time (~16MB as float32)
+NUM_BATCHES = 100
+MAX_WORDS_PER_DOC = 400    # words kept per conversation
+LABEL_CAPACITY = 2000      # most frequent terms tracked for labelling topics
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-1 of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def feature(term):
+    """Hashed column for a term."""
+    return zlib.crc32(term.encode()) % NUM_FEATURES
+
+
+class TopicModel:
+    """Hashing TF-IDF + mini-batch k-means over conversations."""
+
+    def __init__(self, num_topics=NUM_TOPICS, seed=1):
+        self.num_topics = num_topics
+        self.seed = seed
+
+        # Sparse rows in CSR form: row i is indices/counts[indptr[i]:indptr[i+1]]
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        self.counts = array("f")
+        self.titles = []
+
+        # Frequent terms, used to turn hashed columns back into words
+        self.term_counts = HeavyHitters(LABEL_CAPACITY)
+
+        self.centroids = None
+        self.assignments = None
+        # Per topic, the conversation closest to its center
+        self.example_rows = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add_document(self, title, words):
+        """Add one conversation's title and prompt words."""
+        words = words[:MAX_WORDS_PER_DOC]
+        if not words:
+            return
+        term_counts = Counter(words)
+        for term, count in term_counts.items():
+            self.term_counts.add(term, count)
+
+        columns = Counter()
+        for term, count in term_counts.items():
+            columns[feature(term)] += count
+        for column, count in sorted(columns.items()):
+            self.indices.append(column)
+            self.counts.append(count)
+        self.indptr.append(len(self.indices))
+        self.titles.append(title)
+
+    def _tfidf(self):
+        """Log-scaled, IDF-weighted, L2-normalized values for every nonzero."""
+        indptr = np.asarray(self.indptr, dtype=np.int64)
+        indices = np.asarray(self.indices, dtype=np.int64)
+        values = 1 + np.log(np.asarray(self.counts, dtype=np.float32))
+
+        doc_freq = np.bincount(indices, minlength=NUM_FEATURES)
+        idf = np.log((1 + len(self)) / (1 + doc_freq)) + 1
+        values = values * idf[indices]
+
+        rows = np.repeat(np.arange(len(self)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(self)))
+        values = values / np.maximum(norms[rows], 1e-12)
+        return indptr, indices, values.astype(np.float32)
+
+    @staticmethod
+    def _dense(rows, indptr, indices, values):
+        """Dense float32 matrix for a handful of rows."""
+        batch = np.zeros((len(rows), NUM_FEATURES), dtype=np.float32)
+        for i, row in enumerate(rows):
+            lo, hi = indptr[row], indptr[row + 1]
+            batch[i, indices[lo:hi]] = values[lo:hi]
+        return batch
+
+    def fit(self):
+        """Cluster the documents with mini-batch (spherical) k-means."""
+        n = len(self)
+        k = min(self.num_topics, n)
+        if k == 0:
+            self.centroids = np.zeros((0, NUM_FEATURES), dtype=np.float32)
+            self.assignments = np.zeros(0, dtype=np.int64)
+            return self
+
+        rng = np.random.default_rng(self.seed)
+        indptr, indices, values = self._tfidf()
+
+        # Start from k random conversations
+        self.centroids = self._dense(rng.choice(n, size=k, replace=False), indptr, indices, values)
+        seen = np.zeros(k)
+
+        for _ in range(NUM_BATCHES):
+            rows = rng.choice(n, size=min(BATCH_SIZE, n), replace=False)
+            batch = self._dense(rows, indptr, indices, values)
+            nearest = np.argmax(batch @ self.centroids.T, axis=1)
+
+            # Each centroid moves toward its points with a shrinking step
+            for j in np.unique(nearest):
+                members = batch[nearest == j]
+                seen[j] += len(members)
+                step = len(members) / seen[j]
+                self.centroids[j] = (1 - step) * self.centroids[j] + step * members.mean(axis=0)
+
+            norms = np.linalg.norm(self.centroids, axis=1, keepdims=True)
+            self.centroids /= np.maximum(norms, 1e-12)
+
+        # Final assignment of every conversation, one batch at a time
+        assignments = np.empty(n, dtype=np.int64)
+        self.example_rows = np.full(k, -1)
+        best_scores = np.full(k, -np.inf)
+        for lo in range(0, n, BATCH_SIZE):
+            rows = np.arange(lo, min(lo + BATCH_SIZE, n))
+            scores = self._dense(rows, indptr, indices, values) @ self.centroids.T
+            nearest = np.argmax(scores, axis=1)
+            assignments[rows] = nearest
+            top = scores[np.arange(len(rows)), nearest]
+            for row, j, score in zip(rows, nearest, top):
+                if score > best_scores[j]:
+                    best_scores[j] = score
+                    self.example_rows[j] = row
+        self.assignments = assignments
+        return self
+
+    def fit_cached(self, cache_key, cache_dir=TOPICS_CACHE_DIR):
+        """Fit, or reuse the model cached for the same export and settings."""
+        key = (cache_key, self.num_topics, NUM_FEATURES, self.seed, len(self))
+        cache_path = os.path.join(cache_dir, digest(*key) + ".pkl")
+        if cache_key and os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["key"] == key:
+                self.centroids = cached["centroids"]
+                self.assignments = cached["assignments"]
+                self.example_rows = cached["example_rows"]
+                return self
+
+        self.fit()
+        if cache_key:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                pickle.dump({
+                    "key": key,
+                    "centroids": self.centroids,
+                    "assignments": self.assignments,
+                    "example_rows": self.example_rows,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return self
+
+    def _column_terms(self):
+        """Most frequent tracked word for each hashed column."""
+        terms = {}
+        for term, _ in self.term_counts.most_common(len(self.term_counts)):
+            terms.setdefault(feature(term), term)
+        return terms
+
+    def top_topics(self, limit=5, words=3):
+        """
+        [(label, conversations, example title)] for the biggest topics. The
+        label is the topic's strongest words, the example is the conversation
+        closest to the topic's center.
+        """
+        if self.assignments is None or len(self.assignments) == 0:
+            return []
+        terms = self._column_terms()
+        sizes = np.bincount(self.assignments, minlength=len(self.centroids))
+
+        topics = []
+        for j in np.argsort(-sizes, kind="stable")[:limit]:
+            if sizes[j] == 0:
+                continue
+            columns = np.argsort(-self.centroids[j])[:words * 2]
+            label = [terms[c] for c in columns if c in terms][:words]
+            example = self.titles[self.example_rows[j]] if self.example_rows[j] >= 0 else ""
+            topics.append((" / ".join(label), int(sizes[j]), example))
+        return topics
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Turn Timing
+
+Response latency and turn-taking from the per-message create_time values in
+each conversation's mapping:
+
+- response latency: user prompt -> first assistant reply to it (a
+  regenerated answer isn't timed: it'd include the time spent reading the
+  first one and asking again)
+- think time: assistant reply -> the user's next prompt in the same sitting
+
+Samples go straight into quantile sketches (overall and per model), so only
+compact summaries are kept, never every sample.
+"""
+from quantile_sketch import KLLSketch
+from sessions import SESSION_GAP_MINUTES
+
+# How far up the tree to look past tool/system messages for the other side of a turn
+MAX_HOPS = 6
+
+
+def previous_turn(mapping, node):
+    """
+    Walk up from a node to the closest earlier user or assistant message,
+    skipping tool calls, system messages and empty nodes. Returns (that
+    message's node, its child on the way down to node), or (None, None).
+    """
+    child = node
+    parent_id = node.get("parent")
+    for _ in range(MAX_HOPS):
+        parent = mapping.get(parent_id)
+        if parent is None:
+            return None, None
+        msg = parent.get("message")
+        if msg and msg.get("create_time"):
+            role = msg.get("author", {}).get("role")
+            if role in ("user", "assistant"):
+                return parent, child
+        child = parent
+        parent_id = parent.get("parent")
+    return None, None
+
+
+def branch_time(mapping, node):
+    """When a branch starts: the first create_time at or below node, following first children."""
+    for _ in range(MAX_HOPS):
+        if node is None:
+            return None
+        msg = node.get("message")
+        if msg and msg.get("create_time"):
+            return msg["create_time"]
+        children = node.get("children") or []
+        node = mapping.get(children[0]) if children else None
+    return None
+
+
+def is_first_branch(mapping, parent, child):
+    """
+    Whether child is the earliest of parent's branches. Later ones are
+    regenerated answers (or edited prompts).
+    """
+    siblings = parent.get("children") or []
+    if len(siblings) < 2:
+        return True
+    started = branch_time(mapping, child)
+    if started is None:
+        return True
+    for sibling_id in siblings:
+        sibling = mapping.get(sibling_id)
+        if sibling is child:
+            # Ties go to the branch listed first
+            return True
+        other = branch_time(mapping, sibling)
+        if other is not None and other <= started:
+            return False
+    return True
+
+
+class TurnTimer:
+    """Streams turn timings into quantile sketches."""
+
+    def __init__(self, session_gap=SESSION_GAP_MINUTES):
+        self.max_think_seconds = session_gap * 60
+        self.latency = KLLSketch()
+        self.think_time = KLLSketch()
+        self.latency_by_model = {}
+        self.turns = 0
+
+    def add_message(self, mapping, node, role, msg_time, model=None):
+        """Record timings for one message with text."""
+        if not msg_time:
+            return
+        previous_node, child = previous_turn(mapping, node)
+        if previous_node is None:
+            return
+        previous = previous_node["message"]
+        previous_role = previous.get("author", {}).get("role")
+        elapsed = msg_time - previous["create_time"]
+        if elapsed < 0:
+            return
+
+        if role == "assistant" and previous_role == "user":
+            # First reply to a prompt; regenerated answers aren't timed
+            if not is_first_branch(mapping, previous_node, child):
+                return
+            self.turns += 1
+            self.latency.add(elapsed)
+            if model:
+                sketch = self.latency_by_model.get(model)
+                if sketch is None:
+                    sketch = self.latency_by_model[model] = KLLSketch()
+                sketch.add(elapsed)
+        elif role == "user" and previous_role == "assistant":
+            # Coming back after a long break is a new session, not think time
+            if elapsed <= self.max_think_seconds:
+                self.think_time.add(elapsed)
+
+    def results(self):
+        """Summaries for the extracted stats."""
+        return {
+            "turns": self.turns,
+            "response_latency": self.latency.summary(),
+            "think_time": self.think_time.summary(),
+            "latency_by_model": {model: sketch.summary()
+                                 for model, sketch in self.latency_by_model.items()},
+        }
@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+"""
+Wrapped Stats
+
+The analytics behind GPT Wrapped as a library, for using the stats outside
+the PDF (in a web backend, a notebook, ...):
+
+    from wrapped_stats import analyze
+    stats = analyze("conversations.json", start="2025-01-01", tz="Europe/Berlin")
+    stats.user_words, stats.top_words, stats.longest_streak
+
+Importing this module has no side effects - config.txt isn't read and
+nothing is written - and it doesn't import reportlab, pypdf, matplotlib or
+PIL, so it starts quickly and stays small. data_extractor.py is the command
+line front end: it adds config.txt settings, the prompt index, the SQLite
+export and draft sampling, and saves the stats for the page modules.
+"""
+from __future__ import annotations
+
+import codecs
+import heapq
+import json
+import os
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import dataclass, fields
+from functools import partial
+from datetime import date, datetime
+
+import numpy as np
+
+from conversation_table import ConversationTable
+from daily_stats import parse_date, period_label
+from streaks import analyze_streaks
+from sessions import detect_sessions, SESSION_GAP_MINUTES
+from turn_timing import TurnTimer
+from length_stats import LengthStats
+from heavy_hitters import HeavyHitters
+from near_duplicates import NearDuplicateFinder, DEFAULT_THRESHOLD, clean_words
+from topics import TopicModel
+from content_scanner import ContentScanner
+from hyperloglog import HyperLogLog
+from spill_counter import SpillingCounter
+from timezones import get_timezone, bucket_times, period_bounds, local_today
+
+# How many distinct words each month's word counter keeps track of
+MONTHLY_WORD_CAPACITY = 100
+
+# Longest prompts kept for the wrap
+TOP_PROMPTS = 10
+
+# Common words to exclude from the "top words" analysis
+STOP_WORDS = {
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of",
+    "is", "it", "that", "this", "with", "as", "be", "are", "was", "were", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will", "would", "could",
+    "should", "may", "might", "can", "i", "you", "he", "she", "we", "they", "my",
+    "your", "his", "her", "our", "their", "what", "which", "who", "how", "when",
+    "where", "why", "if", "then", "else", "not", "no", "yes", "so", "just", "like",
+    "more", "some", "any", "all", "also", "from", "by", "about", "into", "through",
+    "during", "before", "after", "above", "below", "between", "under", "over",
+    "out", "up", "down", "off", "such", "there", "here", "than", "its", "let", "me",
+    "im", "dont", "cant", "wont", "youre", "theyre", "were", "ive", "use", "using",
+    "want", "need", "get", "make", "know", "see", "think", "one", "two", "new"
+}
+
+
+def tokenize(text):
+    """
+    Split text into the cleaned, lowercase words used for frequency analysis.
+    Short words and common stop words are dropped.
+    """
+    return [word for word in clean_words(text) if len(word) > 2 and word not in STOP_WORDS]
+
+
+
+def iter_conversations(source, chunk_size=1 << 20):
+    """
+    Yield the conversations in an export one at a time, reading it in chunks
+    instead of parsing it all at once. source is a path or an open file
+    (text, or binary in UTF-8).
+    """
+    yield from ExportReader(source, chunk_size)
+
+
+class ExportReader:
+    """
+    The conversations in an export, read in chunks like iter_conversations(),
+    keeping track of where they are in the file: tell() is the byte offset
+    just after the last conversation returned, and a reader created with
+    that offset carries on from there. Offsets are byte offsets, so they
+    work for paths and binary files but not text files.
+    """
+
+    def __init__(self, source, chunk_size=1 << 20, offset=0):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.offset = offset
+        # Offset of the start of the buffer, and the buffer and position in it
+        self._base = offset
+        self._buf = ""
+        self._pos = 0
+        self._binary = False
+
+    def tell(self):
+        consumed = self._buf[:self._pos]
+        return self._base + self._size(consumed)
+
+    def _size(self, text):
+        """Size of decoded text in the file (bytes, for a binary file)."""
+        if not self._binary or text.isascii():
+            return len(text)
+        return len(text.encode("utf-8"))
+
+    def __iter__(self):
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as f:
+                yield from self._parse(f)
+        else:
+            yield from self._parse(self.source)
+
+    def _parse(self, source):
+        if self.offset:
+            source.seek(self.offset)
+        read = source.read
+        if isinstance(read(0), bytes):
+            self._binary = True
+            decode = codecs.getincrementaldecoder("utf-8")().decode
+            read = lambda size: decode(source.read(size))
+        chunk_size = self.chunk_size
+
+        decoder = json.JSONDecoder()
+        buf = read(chunk_size)
+        if self.offset:
+            # Resuming just after a conversation
+            pos = 0
+        else:
+            start = len(buf) - len(buf.lstrip())
+            if not buf.startswith("[", start):
+                raise ValueError("expected the export to be a JSON list of conversations")
+            pos = start + 1
+        while True:
+            # Skip separators, reading more if the chunk ran out
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                self._base += self._size(buf)
+                buf, pos = read(chunk_size), 0
+                self._buf, self._pos = buf, pos
+                if not buf:
+                    raise ValueError("export ended before the closing ]")
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                conversation, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The conversation runs past this chunk: read more (at least
+                # doubling, so a huge conversation isn't re-parsed too often)
+                more = read(max(chunk_size, len(buf) - pos))
+                if not more:
+                    raise
+                self._base += self._size(buf[:pos])
+                buf, pos = buf[pos:] + more, 0
+                self._buf, self._pos = buf, pos
+                continue
+            pos = end
+            self._buf, self._pos = buf, pos
+            yield conversation
+
+
+def in_period(conversation, bounds):
+    """Whether a conversation was created within bounds (see period_bounds)."""
+    create_time = conversation.get("create_time")
+    return bool(create_time) and bounds[0] <= create_time < bounds[1]
+
+
+
+class Extraction:
+    """
+    The running totals behind extract_all_data(), fed conversations a batch
+    at a time. Everything it holds can be pickled (with no sink), so a long
+    extraction can be saved part way and continued (see checkpoint.py);
+    adding the same conversations in any batches gives the same results.
+    """
+
+    def __init__(self, index=None, sink=None, session_gap=SESSION_GAP_MINUTES,
+                 dup_threshold=DEFAULT_THRESHOLD, exclude_code=False,
+                 word_memory_limit=None, tz=None):
+        self.index = index
+        self.sink = sink
+        self.session_gap = session_gap
+        self.tz = tz
+        self.conversations = 0
+
+        # Counters for totals
+        self.user_words = 0
+        self.gpt_words = 0
+        self.user_messages = 0
+        self.gpt_messages = 0
+
+        # Count every word the user typed for frequency analysis
+        self.word_freq = SpillingCounter(word_memory_limit)
+        self.user_tokens = 0
+
+        # The longest prompts so far, as (word count, title) in a min-heap
+        self.user_prompts = []
+
+        # Count which GPT models were used
+        self.model_counts = Counter()
+
+        # Activity tracking: every conversation's local hour, day and month,
+        # bucketed in one vectorized step per batch
+        self.hour_counts = np.zeros(24, dtype=np.int64)
+        self.month_counts = np.zeros(13, dtype=np.int64)
+        self.active_days = []
+        self.message_times = array("d")
+
+        # Response latency and think time between turns
+        self.timer = TurnTimer(session_gap)
+
+        # Prompt, response and conversation length distributions
+        self.lengths = LengthStats()
+
+        # Compact per-conversation metrics (messages, words, duration, ...)
+        self.table = ConversationTable()
+
+        # Per-month word counters and (month, model id) pairs for every reply
+        self.monthly_words = defaultdict(partial(HeavyHitters, MONTHLY_WORD_CAPACITY))
+        self.reply_months = array("l")
+        self.reply_models = array("l")
+
+        # Distinct words per month, merged later for the whole period
+        self.monthly_vocab = defaultdict(HyperLogLog)
+
+        # MinHash/LSH over prompts to find questions asked again and again
+        self.duplicates = NearDuplicateFinder(dup_threshold)
+
+        # Each conversation's title and prompt words, clustered into topics
+        self.topics = TopicModel()
+
+        # Code blocks by language, lines of code and images/files/audio shared
+        self.content = ContentScanner(exclude_code)
+
+    def add(self, conversations):
+        """Add a batch (a list) of conversations."""
+        index, sink, content, table = self.index, self.sink, self.content, self.table
+        created = bucket_times([c.get("create_time") or np.nan for c in conversations], self.tz)
+        known = created["day"] >= 0
+        self.hour_counts += np.bincount(created["hour"][known], minlength=24)
+        self.month_counts += np.bincount(created["month"][known], minlength=13)
+        self.active_days.append(created["day"][known])
+        conversation_months = created["month"]
+        self.conversations += len(conversations)
+
+        for i, conversation in enumerate(conversations):
+            title = conversation.get("title", "Untitled")
+            conversation_id = conversation.get("id") or conversation.get("conversation_id")
+            if index is not None:
+                conv_idx = index.add_conversation(conversation_id, title)
+
+            # Record when this conversation happened
+            create_time = conversation.get("create_time")
+            month = int(conversation_months[i]) if conversation_months[i] > 0 else None
+
+            # Per-conversation metrics for the conversation table
+            msg_count = 0
+            conv_user_messages = 0
+            conv_gpt_messages = 0
+            conv_user_words = 0
+            conv_gpt_words = 0
+            conv_models = Counter()
+            conv_words = tokenize(title or "")
+            first_time = None
+            last_time = None
+            branches = 1
+
+            mapping = conversation.get("mapping", {})
+            for node_id, node in mapping.items():
+                # Every extra child is an edited prompt or regenerated answer
+                branches += max(len(node.get("children") or ()) - 1, 0)
+
+                msg = node.get("message")
+                if not msg:
+                    continue
+
+                role = msg.get("author", {}).get("role")
+                parts = msg.get("content", {}).get("parts", [])
+                text = " ".join(str(p) for p in parts if isinstance(p, str))
+                prose = content.scan(role, msg, text)
+
+                if not text.strip():
+                    continue
+
+                word_count = len(text.split())
+                msg_count += 1
+                model = None
+
+                msg_time = msg.get("create_time")
+                if msg_time:
+                    self.message_times.append(msg_time)
+                    if first_time is None or msg_time < first_time:
+                        first_time = msg_time
+                    if last_time is None or msg_time > last_time:
+                        last_time = msg_time
+
+                if role == "user":
+                    self.user_words += word_count
+                    self.user_messages += 1
+                    conv_user_words += word_count
+                    conv_user_messages += 1
+                    if len(self.user_prompts) < TOP_PROMPTS:
+                        heapq.heappush(self.user_prompts, (word_count, title))
+                    elif (word_count, title) > self.user_prompts[0]:
+                        heapq.heapreplace(self.user_prompts, (word_count, title))
+                    self.lengths.add_prompt(word_count)
+                    self.duplicates.add(text)
+
+                    # Extract individual words for frequency analysis
+                    words = tokenize(prose)
+                    self.word_freq.update(words)
+                    self.user_tokens += len(words)
+                    conv_words.extend(words)
+                    self.monthly_vocab[month].update(words)
+                    if month:
+                        self.monthly_words[month].update(words)
+                    if index is not None:
+                        index.add_message(conv_idx, msg_count - 1, words)
+
+                elif role == "assistant":
+                    self.gpt_words += word_count
+                    self.gpt_messages += 1
+                    conv_gpt_messages += 1
+                    conv_gpt_words += word_count
+                    self.lengths.add_response(word_count)
+
+                    # Track which model generated this response
+                    model = msg.get("metadata", {}).get("model_slug", "unknown")
+                    if model:
+                        self.model_counts[model] += 1
+                        conv_models[model] += 1
+                        if month:
+                            self.reply_months.append(month - 1)
+                            self.reply_models.append(table.intern_model(model))
+
+                if role in ("user", "assistant"):
+                    self.timer.add_message(mapping, node, role, msg_time, model)
+
+                if sink is not None:
+                    sink.add_message(msg.get("id") or node_id, conversation_id, msg_count - 1,
+                                     role, msg.get("create_time"), word_count, model)
+
+            if sink is not None:
+                sink.add_conversation(conversation_id, title, create_time,
+                                      conversation.get("update_time"), msg_count)
+
+            if msg_count:
+                self.lengths.add_conversation(msg_count)
+            self.topics.add_document(title, conv_words)
+
+            table.add(
+                conversation_id, title,
+                create_time=create_time,
+                messages=msg_count,
+                user_messages=conv_user_messages,
+                assistant_messages=conv_gpt_messages,
+                user_words=conv_user_words,
+                assistant_words=conv_gpt_words,
+                duration=(last_time - first_time) if first_time else 0,
+                branches=branches,
+                model=conv_models.most_common(1)[0][0] if conv_models else None,
+            )
+
+    def results(self, start=None, end=None, topic_cache_key=None):
+        """The stats dict for everything added (call once, at the end)."""
+        table = self.table
+        table.finalize()
+
+        # Streaks, gaps and active days from a per-day activity bitmap
+        active_days = (np.concatenate(self.active_days) if self.active_days
+                       else np.zeros(0, dtype=np.int64))
+        streaks = analyze_streaks(active_days, start, end, today=local_today(self.tz))
+
+        # Sittings, split wherever there's a long silence between messages
+        sessions = detect_sessions(self.message_times, self.session_gap, self.tz)
+
+        # Month x model reply counts (rows Jan..Dec, columns table.model_names)
+        num_models = len(table.model_names)
+        flat = (np.array(self.reply_months, dtype=np.int64) * num_models
+                + np.array(self.reply_models, dtype=np.int64))
+        monthly_models = np.bincount(flat, minlength=12 * num_models).reshape(12, num_models)
+
+        self.topics.fit_cached(topic_cache_key)
+
+        # Compile the final results
+        top_words = self.word_freq.most_common(10)
+        self.word_freq.close()
+
+        longest = table.top("messages", 1)
+        if longest and table.columns["messages"][longest[0]] > 0:
+            longest_chat_title = table.titles[longest[0]]
+            max_messages = int(table.columns["messages"][longest[0]])
+        else:
+            longest_chat_title = "N/A"
+            max_messages = 0
+
+        return {
+            "user_words": self.user_words,
+            "gpt_words": self.gpt_words,
+            "user_messages": self.user_messages,
+            "gpt_messages": self.gpt_messages,
+            "top_words": top_words,
+            "top_prompts": sorted(self.user_prompts, reverse=True),
+            "model_usage": self.model_counts.most_common(10),
+            "hourly_activity": {hour: int(count) for hour, count
+                                in enumerate(self.hour_counts) if count},
+            "monthly_activity": {month: int(count) for month, count
+                                 in enumerate(self.month_counts) if count},
+            "monthly_top_words": {month: counter.most_common(5)
+                                  for month, counter in sorted(self.monthly_words.items())},
+            "monthly_model_names": list(table.model_names),
+            "monthly_model_counts": monthly_models,
+            "model_switches": model_switches(monthly_models, table.model_names),
+            "repeated_prompts": self.duplicates.clusters(5),
+            "top_topics": self.topics.top_topics(5),
+            **vocabulary_stats(self.monthly_vocab, self.user_tokens),
+            **streaks,
+            **sessions,
+            **self.timer.results(),
+            **self.lengths.results(),
+            **self.content.results(),
+            "longest_chat_title": longest_chat_title,
+            "longest_chat_messages": max_messages,
+            "longest_chat_by_words": table.top_titles("user_words", 5),
+            "longest_chat_by_duration": table.top_titles("duration", 5),
+            "conversation_table": table,
+            "total_conversations": self.conversations,
+        }
+
+
+def extract_all_data(conversations, index=None, sink=None, start=None, end=None,
+                     session_gap=SESSION_GAP_MINUTES, dup_threshold=DEFAULT_THRESHOLD,
+                     topic_cache_key=None, exclude_code=False,
+                     word_memory_limit=None, tz=None):
+    """
+    Process all conversations and extract analytics including:
+    - Word and message counts
+    - Most used words
+    - Model usage breakdown
+    - Activity patterns by hour and month
+    - Longest usage streak
+    - Longest conversation
+
+    If a PromptIndex is passed in, every user prompt is also added to it
+    so the prompts can be searched later without rescanning the export.
+    If a SQLiteSink is passed in, every conversation and message is also
+    written to it as a row. start/end set the period used for streaks and
+    the active-day percentage, and session_gap is the number of idle
+    minutes that ends a session. Prompts at least dup_threshold similar
+    are grouped as repeats of the same question. If topic_cache_key is
+    given, the topic model is cached under that key and reused next time.
+    With exclude_code, fenced code blocks are left out of the word counts.
+    word_memory_limit caps how many different words are counted in memory
+    before spilling to disk (the counts stay exact). The other per-word
+    counts (per month, topic labels) have a fixed size anyway; the index, if
+    one is given, isn't capped, as it holds every prompt's words. Hours, days
+    and months are in timezone tz (a ZoneInfo, None for this machine's time).
+    """
+    extraction = Extraction(index, sink, session_gap, dup_threshold, exclude_code,
+                            word_memory_limit, tz)
+    extraction.add(conversations)
+    return extraction.results(start, end, topic_cache_key)
+
+
+def model_switches(monthly_models, model_names):
+    """[(month, model)] for each month whose most-used model changed."""
+    switches = []
+    previous = None
+    for month, row in enumerate(monthly_models, start=1):
+        if row.sum() == 0:
+            continue
+        top = model_names[int(np.argmax(row))]
+        if top != previous:
+            switches.append((month, top))
+            previous = top
+    return switches
+
+
+def vocabulary_stats(monthly_vocab, total_words):
+    """
+    Unique words for the period and each month, the type/token ratio
+    (unique words / words) and how the vocabulary grew month by month.
+    monthly_vocab maps month (None if unknown) to a HyperLogLog.
+    """
+    sketch = HyperLogLog()
+    for month_sketch in monthly_vocab.values():
+        sketch.merge(month_sketch)
+    unique_words = sketch.count()
+
+    # Cumulative unique words at the end of each month
+    growth = []
+    seen = HyperLogLog()
+    for month in sorted(m for m in monthly_vocab if m is not None):
+        growth.append((month, seen.merge(monthly_vocab[month]).count()))
+
+    return {
+        "unique_words": unique_words,
+        "type_token_ratio": unique_words / total_words if total_words else 0.0,
+        "monthly_unique_words": {month: monthly_vocab[month].count()
+                                 for month, _ in growth},
+        "vocabulary_growth": growth,
+        "vocabulary_grew_by": growth[-1][1] - growth[0][1] if growth else 0,
+        "vocabulary_sketch": sketch,
+    }
+
+
+
+# eq=False: fields like the ConversationTable and the sketches have no value
+# equality, so a generated __eq__ would compare them by identity anyway (and
+# call a pickled copy different from the original). Stats are compared by
+# identity, like the objects in them.
+@dataclass(frozen=True, eq=False)
+class WrappedStats:
+    """
+    Everything GPT Wrapped works out about a period of conversations.
+    to_dict() gives the same dict data_extractor.py saves for the pages.
+    """
+    # The period and timezone the stats are for
+    period_label: str
+    period_start: datetime | None
+    period_end: datetime | None
+    timezone: str | None
+
+    # Totals
+    total_conversations: int
+    user_words: int
+    gpt_words: int
+    user_messages: int
+    gpt_messages: int
+
+    # Words: [(word, count)], most used first
+    top_words: list[tuple[str, int]]
+    monthly_top_words: dict[int, list[tuple[str, int]]]
+    unique_words: int
+    type_token_ratio: float
+    monthly_unique_words: dict[int, int]
+    vocabulary_growth: list[tuple[int, int]]
+    vocabulary_grew_by: int
+    vocabulary_sketch: HyperLogLog
+
+    # Prompts: [(words, conversation title)] and [(times asked, example)]
+    top_prompts: list[tuple[int, str]]
+    repeated_prompts: list[tuple[int, str]]
+    top_topics: list[tuple[str, int, str]]
+
+    # Models
+    model_usage: list[tuple[str, int]]
+    monthly_model_names: list[str]
+    monthly_model_counts: np.ndarray
+    model_switches: list[tuple[int, str]]
+
+    # When: conversations by hour (0-23) and month (1-12)
+    hourly_activity: dict[int, int]
+    monthly_activity: dict[int, int]
+
+    # Streaks and gaps (see streaks.py)
+    longest_streak: int
+    streak_start: date | None
+    streak_end: date | None
+    current_streak: int
+    top_streaks: list[tuple[int, date, date]]
+    longest_gap: int
+    gap_start: date | None
+    gap_end: date | None
+    longest_weekly_streak: int
+    active_days: int
+    active_day_pct: float
+
+    # Sessions (see sessions.py)
+    session_count: int
+    session_gap_minutes: float
+    median_session_minutes: float
+    longest_session_minutes: float
+    longest_session_start: datetime | None
+    messages_per_session: float
+    busiest_session_messages: int
+    busiest_session_start: datetime | None
+
+    # Turn timing (see turn_timing.py): dicts of count/min/p50/p90/p99/max
+    turns: int
+    response_latency: dict[str, float]
+    think_time: dict[str, float]
+    latency_by_model: dict[str, dict[str, float]]
+
+    # Lengths (see length_stats.py): summaries and (bin edges, counts)
+    length_stats: LengthStats
+    prompt_length: dict[str, float]
+    prompt_length_histogram: tuple[list[float], list[int]]
+    response_length: dict[str, float]
+    response_length_histogram: tuple[list[float], list[int]]
+    conversation_length: dict[str, float]
+    conversation_length_histogram: tuple[list[float], list[int]]
+
+    # Code and attachments (see content_scanner.py)
+    code_blocks: int
+    code_languages: list[tuple[str, int]]
+    code_lines_requested: int
+    code_lines_received: int
+    content_types: dict[str, int]
+    media_counts: dict[str, int]
+
+    # Longest conversations
+    longest_chat_title: str
+    longest_chat_messages: int
+    longest_chat_by_words: list[tuple[str, int]]
+    longest_chat_by_duration: list[tuple[str, float]]
+    conversation_table: ConversationTable
+
+    # dataclass(slots=True) needs Python 3.10; fields have no defaults, so
+    # slots can be declared directly
+    __slots__ = tuple(__annotations__)
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def to_dict(self):
+        """The stats as a plain dict (not a copy of the values)."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+def analyze(source, *, start=None, end=None, tz=None, session_gap=SESSION_GAP_MINUTES,
+            dup_threshold=DEFAULT_THRESHOLD, exclude_code=False, word_memory_limit=None):
+    """
+    Stats for the conversations created in [start, end), as a WrappedStats.
+
+    source is the path of a conversations.json, an open file (text or
+    binary) or an iterable of already parsed conversations; files are
+    streamed and only the period's conversations are kept. start and end
+    are dates, datetimes or "YYYY-MM-DD" strings (None for no limit), and
+    tz an IANA name like "America/New_York" or a tzinfo (None for this
+    machine's time). The other options are the same as extract_all_data's.
+    """
+    start, end = parse_date(start), parse_date(end)
+    zone = get_timezone(tz) if isinstance(tz, str) else tz
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        source = iter_conversations(source)
+
+    bounds = period_bounds(start, end, zone)
+    conversations = [c for c in source if in_period(c, bounds)]
+    data = extract_all_data(conversations, start=start, end=end, session_gap=session_gap,
+                            dup_threshold=dup_threshold, exclude_code=exclude_code,
+                            word_memory_limit=word_memory_limit, tz=zone)
+    return WrappedStats(
+        period_label=period_label(start, end),
+        period_start=start,
+        period_end=end,
+        timezone=tz if isinstance(tz, str) else getattr(zone, "key", None),
+        **data,
+    )